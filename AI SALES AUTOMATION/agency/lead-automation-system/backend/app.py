@@ -1,9 +1,19 @@
 import os
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, jsonify, request, render_template, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
+from celery import Celery, group
+from celery.result import GroupResult
 import json
+import orjson
+import hmac
+import hashlib
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 # Load environment variables
@@ -17,22 +27,50 @@ from services.payment_service import PaymentService
 from services.tracking_service import TrackingService
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
-)
+# Records are queued on the calling thread and written to file/stdout
+# by a background listener so request threads never block on log I/O
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler("app.log")]
+if os.environ.get('DEBUG', 'True') == 'True':
+    log_handlers.append(logging.StreamHandler())
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# JSON provider backed by orjson
+class OrjsonProvider(JSONProvider):
+    """
+    Serialize Flask JSON responses and parse request bodies with orjson
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__,
             static_folder='../frontend',
             template_folder='../frontend')
+app.json = OrjsonProvider(app)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 2 * 1024 * 1024))
 CORS(app)
 
+# Initialize Celery (email sends run on a dedicated worker queue)
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+celery = Celery('leads', broker=REDIS_URL, backend=REDIS_URL)
+celery.conf.task_routes = {'leads.send_lead_email': {'queue': 'email_queue'}}
+celery.conf.worker_concurrency = 4
+
 # Initialize services
 apollo_service = ApolloService()
 email_service = EmailService()
@@ -40,7 +78,15 @@ sheets_service = SheetsService()
 payment_service = PaymentService()
 tracking_service = TrackingService()
 
+# In-process background threads for lead updates. Leads live in this process's
+# SheetsService, so these writes can't be handed to a Celery worker.
+background_executor = ThreadPoolExecutor(max_workers=4)
+
 # Authentication middleware
+# In a real app, tokens would be issued and verified as JWTs
+# For demonstration, we accept a fixed set of admin tokens
+VALID_ADMIN_TOKENS = frozenset({os.environ.get('ADMIN_TOKEN', 'admin-token').encode()})
+
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -52,15 +98,46 @@ def admin_required(f):
         if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({"success": False, "error": "Authentication required"}), 401
 
-        token = auth_header.replace('Bearer ', '')
+        token = auth_header[7:].encode()
 
-        # Check if token is valid (in a real app, this would use JWT verification)
-        if token != 'admin-token':
+        # Check if token is valid (constant-time compare against each admin token)
+        if not any(hmac.compare_digest(token, valid) for valid in VALID_ADMIN_TOKENS):
             return jsonify({"success": False, "error": "Admin access required"}), 403
 
         return f(*args, **kwargs)
     return decorated_function
 
+# Webhook signature verification
+# Senders sign the raw request body with HMAC-SHA256 using WEBHOOK_SECRET
+WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET', '').encode()
+if not WEBHOOK_SECRET:
+    logger.warning("WEBHOOK_SECRET not set. Incoming webhooks will be rejected.")
+
+def webhook_signature_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # Verify the raw body before it is parsed or queued
+        if not WEBHOOK_SECRET:
+            return jsonify({"success": False, "error": "Invalid signature"}), 401
+
+        signature = request.headers.get('X-Signature', '').encode()
+        expected = hmac.new(WEBHOOK_SECRET, request.get_data(), hashlib.sha256).hexdigest().encode()
+        if not hmac.compare_digest(signature, expected):
+            return jsonify({"success": False, "error": "Invalid signature"}), 401
+
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Background tasks
+@celery.task(name='leads.send_lead_email', queue='email_queue')
+def send_lead_email(lead, stage):
+    """
+    Send a single campaign email from a Celery worker
+
+    Campaigns are tracked by the web process, not in the worker's memory.
+    """
+    return email_service.send_lead_email(lead, stage, track=False)
+
 # Routes
 @app.route('/')
 def index():
@@ -102,17 +179,58 @@ def start_outreach():
         data = request.json
         lead_ids = data.get('lead_ids', [])
 
+        if not isinstance(lead_ids, list):
+            return jsonify({"success": False, "error": "lead_ids must be a list"}), 400
+
         # Get leads from spreadsheet
         leads = sheets_service.get_leads(lead_ids)
 
-        # Start outreach campaign
-        results = email_service.start_campaign(leads)
+        # Track campaigns here, where reply webhooks are handled; they stay
+        # Queued until the outreach status shows whether the email was sent
+        for lead in leads:
+            email_service.record_campaign(lead.get("id"), 'initial', status='Queued')
 
-        return jsonify({"success": True, "data": results})
+        # Queue one email task per lead; workers send them in parallel
+        group_result = group(send_lead_email.s(lead, 'initial') for lead in leads).apply_async()
+        group_result.save()
+
+        return jsonify({"success": True, "data": {"group_id": group_result.id, "queued": len(leads)}})
     except Exception as e:
         logger.error(f"Error starting outreach: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/outreach/status/<group_id>', methods=['GET'])
+def outreach_status(group_id):
+    """
+    Get progress of a queued outreach campaign
+    """
+    try:
+        group_result = GroupResult.restore(group_id, app=celery)
+
+        if group_result is None:
+            return jsonify({"success": False, "error": "Campaign not found"}), 404
+
+        status = {
+            "total": len(group_result.results),
+            "completed": group_result.completed_count(),
+            "ready": group_result.ready()
+        }
+
+        # Summarize per-lead results once every task has finished
+        if status["ready"]:
+            leads = group_result.get(propagate=False)
+            leads = [lead for lead in leads if isinstance(lead, dict)]
+            for lead in leads:
+                email_service.settle_queued_campaign(lead.get("id"), lead.get("status") == "Success")
+            status["success"] = sum(1 for lead in leads if lead.get("status") == "Success")
+            status["failed"] = status["total"] - status["success"]
+            status["leads"] = leads
+
+        return jsonify({"success": True, "data": status})
+    except Exception as e:
+        logger.error(f"Error getting outreach status: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/lead/update', methods=['POST'])
 def update_lead():
     """
@@ -149,8 +267,8 @@ def create_payment():
         # Create payment link
         payment_link = payment_service.create_payment_link(country, amount, lead)
 
-        # Update lead with payment link
-        sheets_service.update_lead(lead_id, 'Payment Sent', f'Payment link: {payment_link}')
+        # Update lead with payment link in the background
+        background_executor.submit(sheets_service.update_lead, lead_id, 'Payment Sent', f'Payment link: {payment_link}')
 
         return jsonify({"success": True, "payment_link": payment_link})
     except Exception as e:
@@ -161,15 +279,38 @@ def create_payment():
 def get_analytics():
     """
     Get sales funnel analytics
+
+    Sections are streamed as they are computed instead of buffering the
+    whole payload.
     """
+    def encode_section(section):
+        key, value = section
+        return orjson.dumps(key) + b':' + orjson.dumps(value, option=OrjsonProvider.option)
+
+    # Compute the first section before the 200 goes out, so a failure
+    # still gets the usual error response
     try:
-        analytics = tracking_service.get_analytics()
-        return jsonify({"success": True, "data": analytics})
+        sections = tracking_service.iter_analytics()
+        head = b'{"success":true,"data":{' + encode_section(next(sections))
     except Exception as e:
         logger.error(f"Error getting analytics: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+    def generate():
+        yield head
+        try:
+            for section in sections:
+                yield b',' + encode_section(section)
+        except Exception as e:
+            # Sections are whole chunks, so the body can still be closed as valid JSON
+            logger.error(f"Error streaming analytics: {str(e)}")
+            yield b',' + encode_section(("error", str(e)))
+        yield b'}}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 @app.route('/api/webhook/email', methods=['POST'])
+@webhook_signature_required
 def email_webhook():
     """
     Handle email reply webhooks
@@ -183,6 +324,7 @@ def email_webhook():
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/webhook/payment', methods=['POST'])
+@webhook_signature_required
 def payment_webhook():
     """
     Handle payment webhooks from Stripe/Razorpay
@@ -195,6 +337,205 @@ def payment_webhook():
         logger.error(f"Error handling payment webhook: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+# Static admin payloads
+# In a real app, these would be fetched from the database
+# For demonstration, mock data is serialized once at import time
+ADMIN_STATS = {
+    "users": {
+        "total": 12,
+        "growth": 5,
+        "active": 10
+    },
+    "campaigns": {
+        "total": 15,
+        "active": 8,
+        "growth": -2
+    },
+    "leads": {
+        "total": 468,
+        "growth": 12,
+        "by_country": {
+            "US": 285,
+            "India": 183
+        },
+        "by_source": {
+            "Apollo": 210,
+            "LinkedIn": 117,
+            "Website": 70,
+            "Referral": 47,
+            "Other": 24
+        }
+    },
+    "conversions": {
+        "rate": 5.7,
+        "growth": 0.8,
+        "by_campaign": {
+            "SaaS Founders": 12.4,
+            "Agency Owners": 9.6,
+            "Tech Startups": 7.2,
+            "E-commerce": 6.8,
+            "Healthcare": 5.2
+        }
+    },
+    "ai_performance": {
+        "email_response_rate": 92,
+        "personalization_accuracy": 87,
+        "lead_qualification_accuracy": 78,
+        "content_generation_quality": 83,
+        "api_call_success_rate": 95
+    },
+    "api_usage": {
+        "Apollo": 580,
+        "Gmail": 420,
+        "Outlook": 320,
+        "Stripe": 180,
+        "Razorpay": 140,
+        "Sheets": 640
+    },
+    "system_health": {
+        "server_status": "Online",
+        "database_status": "Healthy",
+        "api_services_status": "Operational",
+        "storage_usage": 42,
+        "storage_free": "8.4 GB",
+        "last_backup": "June 20, 2023 (04:30 AM)"
+    }
+}
+ADMIN_STATS_BODY = orjson.dumps({"success": True, "data": ADMIN_STATS})
+
+ADMIN_USERS = [
+    {
+        "id": "1",
+        "email": "admin@example.com",
+        "name": "Admin User",
+        "role": "admin",
+        "lastLogin": "2023-06-22T14:35:12Z",
+        "status": "active"
+    },
+    {
+        "id": "2",
+        "email": "sarah@example.com",
+        "name": "Sarah Johnson",
+        "role": "user",
+        "lastLogin": "2023-06-22T10:12:45Z",
+        "status": "active"
+    },
+    {
+        "id": "3",
+        "email": "mike@example.com",
+        "name": "Mike Davis",
+        "role": "user",
+        "lastLogin": "2023-06-21T16:42:19Z",
+        "status": "active"
+    }
+]
+ADMIN_USERS_BODY = orjson.dumps({"success": True, "data": ADMIN_USERS})
+
+CONTENT_SCHEDULE = [
+    {
+        "id": "1",
+        "type": "Email Sequence",
+        "campaign": "Tech Startup Outreach",
+        "scheduled_date": "2023-06-25",
+        "status": "Pending",
+        "creator": "AI Assistant"
+    },
+    {
+        "id": "2",
+        "type": "LinkedIn Post",
+        "campaign": "Agency Growth 2023",
+        "scheduled_date": "2023-06-26",
+        "status": "Approved",
+        "creator": "AI Assistant"
+    },
+    {
+        "id": "3",
+        "type": "Follow-up Email",
+        "campaign": "SaaS Founders",
+        "scheduled_date": "2023-06-27",
+        "status": "Drafting",
+        "creator": "AI Assistant"
+    },
+    {
+        "id": "4",
+        "type": "Sales Call Script",
+        "campaign": "E-commerce Solutions",
+        "scheduled_date": "2023-06-28",
+        "status": "In Review",
+        "creator": "Sarah J."
+    },
+    {
+        "id": "5",
+        "type": "Case Study",
+        "campaign": "Healthcare Tech",
+        "scheduled_date": "2023-06-30",
+        "status": "In Progress",
+        "creator": "AI Assistant"
+    }
+]
+CONTENT_SCHEDULE_BODY = orjson.dumps({"success": True, "data": CONTENT_SCHEDULE})
+
+SYSTEM_LOGS = [
+    {
+        "id": "1",
+        "timestamp": "2023-06-22T15:15:32Z",
+        "type": "user_creation",
+        "description": "New user registered: Sarah Johnson (sarah@example.com)",
+        "level": "info"
+    },
+    {
+        "id": "2",
+        "timestamp": "2023-06-22T14:30:12Z",
+        "type": "campaign_creation",
+        "description": "Campaign created: Tech Startup Outreach 2023",
+        "level": "info"
+    },
+    {
+        "id": "3",
+        "timestamp": "2023-06-22T13:02:45Z",
+        "type": "api_update",
+        "description": "Apollo.io API configuration updated",
+        "level": "info"
+    },
+    {
+        "id": "4",
+        "timestamp": "2023-06-22T09:23:18Z",
+        "type": "template_update",
+        "description": "Email template modified: Follow-up #2 for Marketing Agencies",
+        "level": "info"
+    },
+    {
+        "id": "5",
+        "timestamp": "2023-06-21T04:30:02Z",
+        "type": "system_backup",
+        "description": "Full database backup completed (3.2 GB)",
+        "level": "info"
+    }
+]
+SYSTEM_LOGS_BODY = orjson.dumps({"success": True, "data": SYSTEM_LOGS})
+
+SALES_PERFORMANCE = {
+    "daily": {
+        "labels": ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+        "us_data": [12, 19, 15, 17, 14, 10, 8],
+        "india_data": [8, 15, 12, 14, 10, 7, 5]
+    },
+    "weekly": {
+        "labels": ['Week 1', 'Week 2', 'Week 3', 'Week 4'],
+        "us_data": [52, 65, 58, 70],
+        "india_data": [42, 48, 39, 55]
+    },
+    "monthly": {
+        "labels": ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
+        "us_data": [65, 78, 90, 85, 110, 125],
+        "india_data": [45, 58, 70, 75, 92, 108]
+    }
+}
+SALES_PERFORMANCE_BODIES = {
+    period: orjson.dumps({"success": True, "data": data})
+    for period, data in SALES_PERFORMANCE.items()
+}
+
 # Admin API Routes
 @app.route('/api/admin/stats', methods=['GET'])
 @admin_required
@@ -202,75 +543,7 @@ def admin_stats():
     """
     Get system statistics for admin dashboard
     """
-    try:
-        # In a real app, this would fetch actual statistics
-        # For demonstration, we'll return mock data
-        stats = {
-            "users": {
-                "total": 12,
-                "growth": 5,
-                "active": 10
-            },
-            "campaigns": {
-                "total": 15,
-                "active": 8,
-                "growth": -2
-            },
-            "leads": {
-                "total": 468,
-                "growth": 12,
-                "by_country": {
-                    "US": 285,
-                    "India": 183
-                },
-                "by_source": {
-                    "Apollo": 210,
-                    "LinkedIn": 117,
-                    "Website": 70,
-                    "Referral": 47,
-                    "Other": 24
-                }
-            },
-            "conversions": {
-                "rate": 5.7,
-                "growth": 0.8,
-                "by_campaign": {
-                    "SaaS Founders": 12.4,
-                    "Agency Owners": 9.6,
-                    "Tech Startups": 7.2,
-                    "E-commerce": 6.8,
-                    "Healthcare": 5.2
-                }
-            },
-            "ai_performance": {
-                "email_response_rate": 92,
-                "personalization_accuracy": 87,
-                "lead_qualification_accuracy": 78,
-                "content_generation_quality": 83,
-                "api_call_success_rate": 95
-            },
-            "api_usage": {
-                "Apollo": 580,
-                "Gmail": 420,
-                "Outlook": 320,
-                "Stripe": 180,
-                "Razorpay": 140,
-                "Sheets": 640
-            },
-            "system_health": {
-                "server_status": "Online",
-                "database_status": "Healthy",
-                "api_services_status": "Operational",
-                "storage_usage": 42,
-                "storage_free": "8.4 GB",
-                "last_backup": "June 20, 2023 (04:30 AM)"
-            }
-        }
-
-        return jsonify({"success": True, "data": stats})
-    except Exception as e:
-        logger.error(f"Error getting admin stats: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return Response(ADMIN_STATS_BODY, mimetype='application/json')
 
 @app.route('/api/admin/users', methods=['GET'])
 @admin_required
@@ -278,40 +551,7 @@ def get_users():
     """
     Get all users (admin only)
     """
-    try:
-        # In a real app, this would fetch from the database
-        # For demonstration, we'll return mock data
-        users = [
-            {
-                "id": "1",
-                "email": "admin@example.com",
-                "name": "Admin User",
-                "role": "admin",
-                "lastLogin": "2023-06-22T14:35:12Z",
-                "status": "active"
-            },
-            {
-                "id": "2",
-                "email": "sarah@example.com",
-                "name": "Sarah Johnson",
-                "role": "user",
-                "lastLogin": "2023-06-22T10:12:45Z",
-                "status": "active"
-            },
-            {
-                "id": "3",
-                "email": "mike@example.com",
-                "name": "Mike Davis",
-                "role": "user",
-                "lastLogin": "2023-06-21T16:42:19Z",
-                "status": "active"
-            }
-        ]
-
-        return jsonify({"success": True, "data": users})
-    except Exception as e:
-        logger.error(f"Error getting users: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return Response(ADMIN_USERS_BODY, mimetype='application/json')
 
 @app.route('/api/admin/content/schedule', methods=['GET'])
 @admin_required
@@ -319,56 +559,7 @@ def get_content_schedule():
     """
     Get upcoming content schedule (admin only)
     """
-    try:
-        # In a real app, this would fetch from the database
-        # For demonstration, we'll return mock data
-        schedule = [
-            {
-                "id": "1",
-                "type": "Email Sequence",
-                "campaign": "Tech Startup Outreach",
-                "scheduled_date": "2023-06-25",
-                "status": "Pending",
-                "creator": "AI Assistant"
-            },
-            {
-                "id": "2",
-                "type": "LinkedIn Post",
-                "campaign": "Agency Growth 2023",
-                "scheduled_date": "2023-06-26",
-                "status": "Approved",
-                "creator": "AI Assistant"
-            },
-            {
-                "id": "3",
-                "type": "Follow-up Email",
-                "campaign": "SaaS Founders",
-                "scheduled_date": "2023-06-27",
-                "status": "Drafting",
-                "creator": "AI Assistant"
-            },
-            {
-                "id": "4",
-                "type": "Sales Call Script",
-                "campaign": "E-commerce Solutions",
-                "scheduled_date": "2023-06-28",
-                "status": "In Review",
-                "creator": "Sarah J."
-            },
-            {
-                "id": "5",
-                "type": "Case Study",
-                "campaign": "Healthcare Tech",
-                "scheduled_date": "2023-06-30",
-                "status": "In Progress",
-                "creator": "AI Assistant"
-            }
-        ]
-
-        return jsonify({"success": True, "data": schedule})
-    except Exception as e:
-        logger.error(f"Error getting content schedule: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return Response(CONTENT_SCHEDULE_BODY, mimetype='application/json')
 
 @app.route('/api/admin/system/logs', methods=['GET'])
 @admin_required
@@ -376,51 +567,7 @@ def get_system_logs():
     """
     Get system activity logs (admin only)
     """
-    try:
-        # In a real app, this would read from log files
-        # For demonstration, we'll return mock data
-        logs = [
-            {
-                "id": "1",
-                "timestamp": "2023-06-22T15:15:32Z",
-                "type": "user_creation",
-                "description": "New user registered: Sarah Johnson (sarah@example.com)",
-                "level": "info"
-            },
-            {
-                "id": "2",
-                "timestamp": "2023-06-22T14:30:12Z",
-                "type": "campaign_creation",
-                "description": "Campaign created: Tech Startup Outreach 2023",
-                "level": "info"
-            },
-            {
-                "id": "3",
-                "timestamp": "2023-06-22T13:02:45Z",
-                "type": "api_update",
-                "description": "Apollo.io API configuration updated",
-                "level": "info"
-            },
-            {
-                "id": "4",
-                "timestamp": "2023-06-22T09:23:18Z",
-                "type": "template_update",
-                "description": "Email template modified: Follow-up #2 for Marketing Agencies",
-                "level": "info"
-            },
-            {
-                "id": "5",
-                "timestamp": "2023-06-21T04:30:02Z",
-                "type": "system_backup",
-                "description": "Full database backup completed (3.2 GB)",
-                "level": "info"
-            }
-        ]
-
-        return jsonify({"success": True, "data": logs})
-    except Exception as e:
-        logger.error(f"Error getting system logs: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    return Response(SYSTEM_LOGS_BODY, mimetype='application/json')
 
 @app.route('/api/admin/sales-performance', methods=['GET'])
 @admin_required
@@ -428,34 +575,10 @@ def get_sales_performance():
     """
     Get sales performance data (admin only)
     """
-    try:
-        period = request.args.get('period', 'monthly')
-
-        # In a real app, this would fetch from a database
-        # For demonstration, we'll return mock data
-        if period == 'daily':
-            data = {
-                "labels": ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
-                "us_data": [12, 19, 15, 17, 14, 10, 8],
-                "india_data": [8, 15, 12, 14, 10, 7, 5]
-            }
-        elif period == 'weekly':
-            data = {
-                "labels": ['Week 1', 'Week 2', 'Week 3', 'Week 4'],
-                "us_data": [52, 65, 58, 70],
-                "india_data": [42, 48, 39, 55]
-            }
-        else:  # monthly
-            data = {
-                "labels": ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-                "us_data": [65, 78, 90, 85, 110, 125],
-                "india_data": [45, 58, 70, 75, 92, 108]
-            }
-
-        return jsonify({"success": True, "data": data})
-    except Exception as e:
-        logger.error(f"Error getting sales performance data: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+    period = request.args.get('period', 'monthly')
+    body = SALES_PERFORMANCE_BODIES.get(period, SALES_PERFORMANCE_BODIES['monthly'])
+
+    return Response(body, mimetype='application/json')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,17 @@
+import os
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker processes: a single gevent worker overlaps I/O-bound requests.
+# Leads, outreach jobs and the background executor live in process memory,
+# so raising WEB_CONCURRENCY needs that state externalized first.
+worker_class = 'gevent'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_connections = 1000
+keepalive = 5
+timeout = 60
+
+# Logging
+accesslog = '-'
+errorlog = '-'
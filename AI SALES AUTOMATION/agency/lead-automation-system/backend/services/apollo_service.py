@@ -1,11 +1,193 @@
 import os
+import time
+import queue
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Search batching settings
+MAX_BATCH = 32
+MAX_DELAY_MS = int(os.environ.get("APOLLO_BATCH_DELAY_MS", 5))
+
+# Sample lead results kept per service, oldest evicted first
+SAMPLE_LEADS_CACHE_SIZE = 1024
+
+class BatchingQueue:
+    """
+    Collects calls arriving within a short window and runs them as one batch
+    """
+    def __init__(self, handler, max_batch=MAX_BATCH, max_delay_ms=MAX_DELAY_MS):
+        self.logger = logging.getLogger(__name__)
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.pending = queue.Queue()
+
+        # Start batching worker in a separate thread
+        self.worker = threading.Thread(target=self._run)
+        self.worker.daemon = True
+        self.worker.start()
+
+    def submit(self, item):
+        """
+        Queue an item and block until its batch has been processed
+
+        Args:
+            item: Item passed to the batch handler
+
+        Returns:
+            The handler result for this item
+        """
+        request = {"item": item, "done": threading.Event(), "result": None, "error": None}
+        self.pending.put(request)
+        request["done"].wait()
+
+        if request["error"]:
+            raise request["error"]
+
+        return request["result"]
+
+    def _run(self):
+        """Drain the queue in batches of up to max_batch items"""
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + self.max_delay
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.handler([request["item"] for request in batch])
+                for request, result in zip(batch, results):
+                    request["result"] = result
+            except Exception as e:
+                self.logger.error(f"Error processing batch of {len(batch)}: {str(e)}")
+                for request in batch:
+                    request["error"] = e
+            finally:
+                for request in batch:
+                    request["done"].set()
+
+class LeadTable:
+    """
+    Column-oriented lead storage; rows are only built as dicts when read
+    """
+    def __init__(self, columns):
+        self.columns = columns
+        self.cols = {name: [] for name in columns}
+
+    def __len__(self):
+        return len(self.cols[self.columns[0]])
+
+    def append(self, lead):
+        """Append a lead dict as a new row"""
+        for name in self.columns:
+            self.cols[name].append(lead.get(name, ""))
+
+    def row(self, i):
+        """Build the dict for a single row"""
+        return {name: self.cols[name][i] for name in self.columns}
+
+    def rows(self, indices):
+        """Yield dicts for the given rows"""
+        for i in indices:
+            yield self.row(i)
+
+    def index(self, column):
+        """Build a value -> row numbers index for a column"""
+        index = {}
+        for i, value in enumerate(self.cols[column]):
+            index.setdefault(value, []).append(i)
+        return {value: tuple(rows) for value, rows in index.items()}
+
+# Sample data for demonstration
+SAMPLE_LEADS = LeadTable([
+    "id", "first_name", "last_name", "email", "title",
+    "company", "industry", "estimated_revenue", "country"
+])
+for sample_lead in [
+    {
+        "id": "US001",
+        "first_name": "John",
+        "last_name": "Smith",
+        "email": "john.smith@example.com",
+        "title": "CEO",
+        "company": "Digital Solutions Inc.",
+        "industry": "SOFTWARE",
+        "estimated_revenue": "$1M-$10M",
+        "country": "US"
+    },
+    {
+        "id": "US002",
+        "first_name": "Jennifer",
+        "last_name": "Davis",
+        "email": "jennifer.davis@example.com",
+        "title": "Founder",
+        "company": "Growth Marketing Agency",
+        "industry": "MARKETING",
+        "estimated_revenue": "$1M-$10M",
+        "country": "US"
+    },
+    {
+        "id": "US003",
+        "first_name": "Michael",
+        "last_name": "Johnson",
+        "email": "michael.j@example.com",
+        "title": "Director",
+        "company": "Tech Innovations LLC",
+        "industry": "IT_SERVICES",
+        "estimated_revenue": "$10M-$50M",
+        "country": "US"
+    },
+    {
+        "id": "IN001",
+        "first_name": "Raj",
+        "last_name": "Patel",
+        "email": "raj.patel@example.com",
+        "title": "Founder & CEO",
+        "company": "CloudTech Solutions",
+        "industry": "IT_SERVICES",
+        "estimated_revenue": "$0-$1M",
+        "country": "IN"
+    },
+    {
+        "id": "IN002",
+        "first_name": "Priya",
+        "last_name": "Sharma",
+        "email": "priya.sharma@example.com",
+        "title": "CTO",
+        "company": "DigiGrowth Technologies",
+        "industry": "SOFTWARE",
+        "estimated_revenue": "$1M-$10M",
+        "country": "IN"
+    },
+    {
+        "id": "IN003",
+        "first_name": "Arjun",
+        "last_name": "Singh",
+        "email": "arjun.singh@example.com",
+        "title": "Managing Director",
+        "company": "Global Services Ltd",
+        "industry": "CONSULTING",
+        "estimated_revenue": "$0-$1M",
+        "country": "IN"
+    }
+]:
+    SAMPLE_LEADS.append(sample_lead)
+
 class ApolloService:
     """
     Service for interacting with Apollo.io API
@@ -15,6 +197,24 @@ class ApolloService:
         self.api_key = os.environ.get("9VoVu59Q46dJoCCgYaseYQ")
         self.api_url = "https://api.apollo.io/v1"
 
+        # Persistent HTTP client so Apollo calls reuse pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+
+        # Sample lead rows by country, built once
+        self.by_country = SAMPLE_LEADS.index("country")
+
+        # (country, industry, revenue) -> read-only sample leads; only the
+        # batcher worker thread touches it, so it needs no lock
+        self._sample_leads_cache = {}
+
+        # Searches arriving within a few ms of each other share one Apollo call
+        self.batcher = BatchingQueue(self._search_leads_bulk)
+
     def search_leads(self, country, industry=None, revenue=None):
         """
         Search for leads on Apollo.io
@@ -28,13 +228,10 @@ class ApolloService:
             list: Leads that match the criteria
         """
         try:
-            self.logger.info(f"Searching leads for country: {country}, industry: {industry}, revenue: {revenue}")
-
-            # This is a simplified mock implementation
-            # In a real application, this would make API calls to Apollo.io
+            self.logger.info("Searching leads for country: %s, industry: %s, revenue: %s", country, industry, revenue)
 
-            # Sample data for demonstration
-            leads = self._get_sample_leads(country, industry, revenue)
+            # Wait for the batched search covering this query
+            leads = self.batcher.submit((country, industry, revenue))
 
             return leads
 
@@ -42,77 +239,56 @@ class ApolloService:
             self.logger.error(f"Error searching leads: {str(e)}")
             raise
 
+    def _search_leads_bulk(self, filter_list):
+        """
+        Run a batch of lead searches together
+
+        Args:
+            filter_list (list): (country, industry, revenue) tuples
+
+        Returns:
+            list: Leads for each filter, in the same order
+        """
+        self.logger.info("Running batched Apollo search for %s queries", len(filter_list))
+
+        # This is a simplified mock implementation
+        # In a real application, this would make one API call to Apollo.io
+        # (mixed_people/search) with the unique filters OR'd together
+
+        # Sample data for demonstration, fetched once per unique filter
+        results = {}
+        for filters in filter_list:
+            if filters not in results:
+                results[filters] = self._get_sample_leads(*filters)
+
+        # Give every caller its own copies since leads are mutated downstream
+        return [[dict(lead) for lead in results[filters]] for filters in filter_list]
+
     def _get_sample_leads(self, country, industry, revenue):
-        """Generate sample leads for demonstration"""
-        if country == "US":
-            return [
-                {
-                    "id": "US001",
-                    "first_name": "John",
-                    "last_name": "Smith",
-                    "email": "john.smith@example.com",
-                    "title": "CEO",
-                    "company": "Digital Solutions Inc.",
-                    "industry": industry or "SOFTWARE",
-                    "estimated_revenue": revenue or "$1M-$10M",
-                    "country": "US"
-                },
-                {
-                    "id": "US002",
-                    "first_name": "Jennifer",
-                    "last_name": "Davis",
-                    "email": "jennifer.davis@example.com",
-                    "title": "Founder",
-                    "company": "Growth Marketing Agency",
-                    "industry": industry or "MARKETING",
-                    "estimated_revenue": revenue or "$1M-$10M",
-                    "country": "US"
-                },
-                {
-                    "id": "US003",
-                    "first_name": "Michael",
-                    "last_name": "Johnson",
-                    "email": "michael.j@example.com",
-                    "title": "Director",
-                    "company": "Tech Innovations LLC",
-                    "industry": industry or "IT_SERVICES",
-                    "estimated_revenue": revenue or "$10M-$50M",
-                    "country": "US"
-                }
-            ]
-        else:
-            return [
-                {
-                    "id": "IN001",
-                    "first_name": "Raj",
-                    "last_name": "Patel",
-                    "email": "raj.patel@example.com",
-                    "title": "Founder & CEO",
-                    "company": "CloudTech Solutions",
-                    "industry": industry or "IT_SERVICES",
-                    "estimated_revenue": revenue or "$0-$1M",
-                    "country": "IN"
-                },
-                {
-                    "id": "IN002",
-                    "first_name": "Priya",
-                    "last_name": "Sharma",
-                    "email": "priya.sharma@example.com",
-                    "title": "CTO",
-                    "company": "DigiGrowth Technologies",
-                    "industry": industry or "SOFTWARE",
-                    "estimated_revenue": revenue or "$1M-$10M",
-                    "country": "IN"
-                },
-                {
-                    "id": "IN003",
-                    "first_name": "Arjun",
-                    "last_name": "Singh",
-                    "email": "arjun.singh@example.com",
-                    "title": "Managing Director",
-                    "company": "Global Services Ltd",
-                    "industry": industry or "CONSULTING",
-                    "estimated_revenue": revenue or "$0-$1M",
-                    "country": "IN"
-                }
-            ]
+        """Generate sample leads for demonstration (cached, read-only)"""
+        key = (country, industry, revenue)
+        cached = self._sample_leads_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = self.by_country.get("US" if country == "US" else "IN", ())
+
+        # Filter overrides applied to every row of this search
+        overrides = {}
+        if industry:
+            overrides["industry"] = industry
+        if revenue:
+            overrides["estimated_revenue"] = revenue
+
+        row = SAMPLE_LEADS.row
+        leads = [row(i) for i in rows]
+
+        if overrides:
+            for lead in leads:
+                lead.update(overrides)
+
+        if len(self._sample_leads_cache) >= SAMPLE_LEADS_CACHE_SIZE:
+            self._sample_leads_cache.pop(next(iter(self._sample_leads_cache)))
+
+        cached = self._sample_leads_cache[key] = tuple(MappingProxyType(lead) for lead in leads)
+        return cached
@@ -0,0 +1,83 @@
+import os
+import logging
+import orjson
+import redis
+from functools import wraps
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool for all memoized services
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+redis_pool = redis.ConnectionPool.from_url(REDIS_URL)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+def redis_memo(ttl=300, version_key=None):
+    """
+    Memoize a service method in Redis
+
+    Cached entries are addressed by the instance's cache_namespace and the
+    current value of the version key, so bumping that key invalidates every
+    entry built from the old version, and a new instance (or process) never
+    reads entries written for another one.
+
+    Args:
+        ttl (int): Seconds to keep a cached result
+        version_key (callable, optional): Maps the method arguments to a version key
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(self, *args):
+            namespace = getattr(self, "cache_namespace", "")
+            try:
+                version = redis_client.get(namespaced_key(namespace, version_key(*args))) if version_key else None
+                key = "memo:{}:{}:{}:{}".format(
+                    namespace,
+                    f.__qualname__,
+                    int(version or 0),
+                    orjson.dumps(args).decode()
+                )
+
+                cached = redis_client.get(key)
+                if cached is not None:
+                    return orjson.loads(cached)
+            except redis.RedisError as e:
+                logger.warning("Redis unavailable, skipping cache: %s", e)
+                return f(self, *args)
+
+            result = f(self, *args)
+
+            try:
+                redis_client.set(key, orjson.dumps(result), ex=ttl)
+            except redis.RedisError as e:
+                logger.warning("Error caching result: %s", e)
+
+            return result
+        return wrapper
+    return decorator
+
+def namespaced_key(namespace, key):
+    """Scope a version key to one service instance"""
+    return f"{namespace}:{key}"
+
+def bump_version(namespace, *keys):
+    """
+    Invalidate memoized entries by incrementing their version keys
+
+    Args:
+        namespace (str): cache_namespace of the instance that owns the entries
+        keys (str): Version keys to bump
+    """
+    try:
+        pipe = redis_client.pipeline()
+        for key in keys:
+            pipe.incr(namespaced_key(namespace, key))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Error bumping cache version: %s", e)
@@ -2,14 +2,39 @@ import os
 import logging
 import smtplib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import queue
+import threading
+from string import Formatter
+from email.message import EmailMessage
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Open SMTP connections (and concurrent sends) allowed per provider
+SMTP_POOL_SIZE = int(os.environ.get("SMTP_POOL_SIZE", 4))
+
+def compile_template(template):
+    """
+    Parse a str.format template once into a render function
+
+    Args:
+        template (str): Template with {field} placeholders
+
+    Returns:
+        callable: Function taking a context dict and returning the formatted string
+    """
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+    def render(context):
+        return "".join(
+            literal if field is None else literal + str(context[field])
+            for literal, field in parts
+        )
+
+    return render
+
 class EmailService:
     """
     Service for sending and managing email outreach
@@ -25,6 +50,17 @@ class EmailService:
         self.outlook_email = os.environ.get("OUTLOOK_EMAIL")
         self.outlook_password = os.environ.get("OUTLOOK_PASSWORD")
 
+        # Email provider per lead country: (sender_email, sender_name, password, smtp_server, port)
+        # Leads outside the US use the India (Gmail) provider
+        self.providers = {
+            "US": (self.outlook_email, "Lead Automation US Team", self.outlook_password, "smtp-mail.outlook.com", 587),
+            "IN": (self.gmail_username, "Lead Automation India Team", self.gmail_password, "smtp.gmail.com", 587)
+        }
+        self.from_headers = {
+            country: f"{sender_name} <{sender_email}>"
+            for country, (sender_email, sender_name, _, _, _) in self.providers.items()
+        }
+
         # Email templates
         self.templates = {
             "initial": {
@@ -89,9 +125,25 @@ class EmailService:
             }
         }
 
+        # Parse templates once instead of on every send
+        for template in self.templates.values():
+            template["subject_fn"] = compile_template(template["subject"])
+            template["body_fn"] = compile_template(template["body"])
+
+        self.calendly_link = os.environ.get("CALENDLY_LINK", "https://calendly.com/example")
+
+        # Small pool of logged-in SMTP connections per provider, reused across sends
+        self._smtp_pool = {}
+        self._smtp_pool_lock = threading.Lock()
+
         # In a real implementation, this would track email campaigns in a database
-        # For demonstration, we'll use in-memory storage
-        self.campaigns = []
+        # For demonstration, we'll use in-memory storage keyed by lead ID
+        self.campaigns_by_lead = {}
+
+    @property
+    def campaigns(self):
+        """List of all tracked campaigns"""
+        return list(self.campaigns_by_lead.values())
 
     def start_campaign(self, leads):
         """
@@ -104,7 +156,7 @@ class EmailService:
             dict: Campaign results
         """
         try:
-            self.logger.info(f"Starting email campaign for {len(leads)} leads")
+            self.logger.info("Starting email campaign for %s leads", len(leads))
 
             results = {
                 "success": 0,
@@ -113,56 +165,101 @@ class EmailService:
             }
 
             for lead in leads:
-                try:
-                    # Send initial email
-                    email_sent = self._send_email(
-                        lead,
-                        self.templates["initial"]["subject"],
-                        self.templates["initial"]["body"],
-                        "initial"
-                    )
-
-                    lead_result = {
-                        "id": lead.get("id"),
-                        "email": lead.get("email"),
-                        "name": f"{lead.get('first_name')} {lead.get('last_name')}",
-                        "status": "Success" if email_sent else "Failed"
-                    }
-
-                    if email_sent:
-                        results["success"] += 1
-
-                        # Create campaign entry
-                        campaign = {
-                            "lead_id": lead.get("id"),
-                            "stage": "initial",
-                            "last_contact": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "replies": 0,
-                            "status": "Active"
-                        }
-                        self.campaigns.append(campaign)
-                    else:
-                        results["failed"] += 1
-
-                    results["leads"].append(lead_result)
-
-                except Exception as e:
-                    self.logger.error(f"Error sending email to {lead.get('email')}: {str(e)}")
+                lead_result = self.send_lead_email(lead, "initial")
+
+                if lead_result["status"] == "Success":
+                    results["success"] += 1
+                else:
                     results["failed"] += 1
-                    results["leads"].append({
-                        "id": lead.get("id"),
-                        "email": lead.get("email"),
-                        "name": f"{lead.get('first_name')} {lead.get('last_name')}",
-                        "status": "Failed",
-                        "error": str(e)
-                    })
+
+                results["leads"].append(lead_result)
 
             return results
 
         except Exception as e:
-            self.logger.error(f"Error starting email campaign: {str(e)}")
+            self.logger.error("Error starting email campaign: %s", e)
             raise
 
+    def record_campaign(self, lead_id, stage, status="Active"):
+        """
+        Track a campaign entry for a lead
+
+        Args:
+            lead_id (str): Lead ID
+            stage (str): Campaign stage (initial, follow_up_1, etc.)
+            status (str, optional): Campaign status
+        """
+        self.campaigns_by_lead[lead_id] = {
+            "lead_id": lead_id,
+            "stage": stage,
+            "last_contact": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "replies": 0,
+            "status": status
+        }
+
+    def settle_queued_campaign(self, lead_id, sent):
+        """
+        Resolve a campaign recorded as Queued once its email task has finished
+
+        Args:
+            lead_id (str): Lead ID
+            sent (bool): Whether the email was sent
+        """
+        campaign = self.campaigns_by_lead.get(lead_id)
+
+        # Leave campaigns that have moved on (e.g. Replied) untouched
+        if not campaign or campaign["status"] != "Queued":
+            return
+
+        if sent:
+            campaign["status"] = "Active"
+        else:
+            del self.campaigns_by_lead[lead_id]
+
+    def send_lead_email(self, lead, stage, track=True):
+        """
+        Send a single campaign email to a lead
+
+        Args:
+            lead (dict): Lead object
+            stage (str): Campaign stage (initial, follow_up_1, etc.)
+            track (bool, optional): Record the campaign in this process once sent
+
+        Returns:
+            dict: Per-lead result
+        """
+        try:
+            template = self.templates[stage]
+
+            # Send email
+            email_sent = self._send_email(
+                lead,
+                template["subject_fn"],
+                template["body_fn"],
+                stage
+            )
+
+            if email_sent and track:
+                # Create campaign entry
+                self.record_campaign(lead.get("id"), stage)
+
+            return {
+                "id": lead.get("id"),
+                "email": lead.get("email"),
+                "name": f"{lead.get('first_name')} {lead.get('last_name')}",
+                "status": "Success" if email_sent else "Failed"
+            }
+
+        except Exception as e:
+            self.logger.error("Error sending email to %s: %s", lead.get('email'), e)
+            return {
+                "id": lead.get("id"),
+                "email": lead.get("email"),
+                "name": f"{lead.get('first_name')} {lead.get('last_name')}",
+                "status": "Failed",
+                "error": str(e)
+            }
+
     def handle_reply(self, data):
         """
         Handle email reply webhook
@@ -174,14 +271,14 @@ class EmailService:
             bool: Success status
         """
         try:
-            self.logger.info(f"Handling email reply: {data}")
+            self.logger.info("Handling email reply: %s", data)
 
             # Extract email data
             email_id = data.get("email_id")
             lead_id = data.get("lead_id")
 
             # Update campaign status
-            campaign = next((c for c in self.campaigns if c.get('lead_id') == lead_id), None)
+            campaign = self.campaigns_by_lead.get(lead_id)
 
             if campaign:
                 campaign["replies"] += 1
@@ -191,76 +288,135 @@ class EmailService:
             return True
 
         except Exception as e:
-            self.logger.error(f"Error handling email reply: {str(e)}")
+            self.logger.error("Error handling email reply: %s", e)
             return False
 
-    def _send_email(self, lead, subject_template, body_template, stage):
+    def _send_email(self, lead, subject_fn, body_fn, stage):
         """
         Send an email to a lead
 
         Args:
             lead (dict): Lead object
-            subject_template (str): Email subject template
-            body_template (str): Email body template
+            subject_fn (callable): Compiled email subject template
+            body_fn (callable): Compiled email body template
             stage (str): Campaign stage
 
         Returns:
             bool: Success status
         """
         try:
-            # Determine which email provider to use based on lead country
-            if lead.get("country") == "US":
-                sender_email = self.outlook_email
-                sender_name = "Lead Automation US Team"
-                password = self.outlook_password
-                smtp_server = "smtp-mail.outlook.com"
-                port = 587
-            else:
-                sender_email = self.gmail_username
-                sender_name = "Lead Automation India Team"
-                password = self.gmail_password
-                smtp_server = "smtp.gmail.com"
-                port = 587
-
             # Prepare recipient
             recipient_email = lead.get("email")
 
             if not recipient_email:
-                self.logger.warning(f"No email address for lead {lead.get('id')}")
+                self.logger.warning("No email address for lead %s", lead.get('id'))
                 return False
 
-            # Prepare email content
-            subject = subject_template.format(
-                first_name=lead.get("first_name", "there"),
-                company=lead.get("company", "your company"),
-                industry=lead.get("industry", "your industry")
-            )
+            # Determine which email provider to use based on lead country
+            provider = "US" if lead.get("country") == "US" else "IN"
+            sender_email, sender_name, password, smtp_server, port = self.providers[provider]
 
-            # Format body
-            body = body_template.format(
-                first_name=lead.get("first_name", "there"),
-                company=lead.get("company", "your company"),
-                industry=lead.get("industry", "your industry"),
-                sender_name=sender_name,
-                calendly_link=os.environ.get("CALENDLY_LINK", "https://calendly.com/example")
-            )
+            # Prepare email content
+            context = {
+                "first_name": lead.get("first_name", "there"),
+                "company": lead.get("company", "your company"),
+                "industry": lead.get("industry", "your industry"),
+                "sender_name": sender_name,
+                "calendly_link": self.calendly_link
+            }
+            subject = subject_fn(context)
+            body = body_fn(context)
 
-            # Create message
-            message = MIMEMultipart()
-            message["From"] = f"{sender_name} <{sender_email}>"
+            # Create message (single-part plain text, no multipart wrapper)
+            message = EmailMessage()
+            message["From"] = self.from_headers[provider]
             message["To"] = recipient_email
             message["Subject"] = subject
+            message.set_content(body)
 
-            # Attach body
-            message.attach(MIMEText(body, "plain"))
+            self.logger.info("Sending %s email to %s: %s", stage, recipient_email, subject)
 
-            # In a real implementation, this would send the email
-            # For demonstration, we'll just log it
-            self.logger.info(f"Sending {stage} email to {recipient_email}: {subject}")
+            # Send over the pooled provider connection when credentials are configured
+            # For demonstration without credentials, we'll just log it
+            if sender_email and password:
+                self._deliver(smtp_server, port, sender_email, password, message)
 
-            # Simulate successful sending
             return True
 
         except Exception as e:
-            self.logger.error(f"Error sending email: {str(e)}")
+            self.logger.error("Error sending email: %s", e)
             return False
+
+    def _smtp_provider_pool(self, smtp_server):
+        """
+        Get the connection slots and idle connections of a provider
+
+        Args:
+            smtp_server (str): SMTP host
+
+        Returns:
+            tuple: (BoundedSemaphore, LifoQueue of idle logged-in connections)
+        """
+        with self._smtp_pool_lock:
+            if smtp_server not in self._smtp_pool:
+                self._smtp_pool[smtp_server] = (
+                    threading.BoundedSemaphore(SMTP_POOL_SIZE),
+                    queue.LifoQueue()
+                )
+            return self._smtp_pool[smtp_server]
+
+    def _connect_smtp(self, smtp_server, port, username, password):
+        """
+        Open a logged-in SMTP connection
+
+        Args:
+            smtp_server (str): SMTP host
+            port (int): SMTP port
+            username (str): Login username
+            password (str): Login password
+
+        Returns:
+            smtplib.SMTP: Open connection
+        """
+        conn = smtplib.SMTP(smtp_server, port)
+        conn.starttls(context=ssl.create_default_context())
+        conn.login(username, password)
+        return conn
+
+    def _deliver(self, smtp_server, port, username, password, message):
+        """
+        Send a message over a pooled provider connection, reconnecting once if it dropped
+
+        Up to SMTP_POOL_SIZE sends per provider run at once, each on its own connection.
+
+        Args:
+            smtp_server (str): SMTP host
+            port (int): SMTP port
+            username (str): Login username
+            password (str): Login password
+            message (Message): Email message to send
+        """
+        slots, idle = self._smtp_provider_pool(smtp_server)
+
+        with slots:
+            try:
+                conn = idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect_smtp(smtp_server, port, username, password)
+
+            try:
+                try:
+                    conn.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    self.logger.info("SMTP connection to %s dropped, reconnecting", smtp_server)
+                    conn = self._connect_smtp(smtp_server, port, username, password)
+                    conn.send_message(message)
+            except Exception:
+                # The connection's state is unknown; don't hand it to the next send
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                raise
+
+            idle.put(conn)
@@ -1,12 +1,18 @@
 import os
 import logging
 import uuid
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Number of processed webhook events remembered for deduplication
+MAX_PROCESSED_EVENTS = 10000
+
 class PaymentService:
     """
     Service for processing payments through Stripe (US) and Razorpay (India)
@@ -26,6 +32,30 @@ class PaymentService:
         # For demonstration, we'll use in-memory storage
         self.payments = []
 
+        # Per-country payment settings, resolved once per link
+        self._country_cfg = {
+            "US": {
+                "provider": "Stripe",
+                "currency": "USD",
+                "url_tpl": "https://example.com/payment/{id}?amount={amt}&currency=USD"
+            },
+            "IN": {
+                "provider": "Razorpay",
+                "currency": "INR",
+                "url_tpl": "https://example.com/payment/{id}?amount={amt}&currency=INR"
+            }
+        }
+
+        # Serializes writes to payments, its indexes and the processed events
+        self._lock = threading.Lock()
+
+        # Lookup indexes over self.payments
+        self._by_id = {}
+        self._by_lead = defaultdict(list)
+
+        # Recently processed webhook events, oldest first
+        self._processed_events = OrderedDict()
+
     def create_payment_link(self, country, amount, lead):
         """
         Create a payment link based on lead location
@@ -39,7 +69,9 @@ class PaymentService:
             str: Payment link URL
         """
         try:
-            self.logger.info(f"Creating payment link for {lead.get('email')}: {country}, amount={amount}")
+            self.logger.info("Creating payment link for %s: %s, amount=%s", lead.get('email'), country, amount)
+
+            cfg = self._country_cfg.get(country, self._country_cfg["IN"])
 
             # Generate payment ID
             payment_id = str(uuid.uuid4())
@@ -52,7 +84,7 @@ class PaymentService:
                 "id": payment_id,
                 "lead_id": lead.get("id"),
                 "amount": amount,
-                "currency": "USD" if country == "US" else "INR",
+                "currency": cfg["currency"],
                 "status": "created",
                 "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "description": f"Services for {lead.get('company', 'your business')}",
@@ -60,28 +92,22 @@ class PaymentService:
                 "customer_email": lead.get("email")
             }
 
-            self.payments.append(payment)
+            with self._lock:
+                self.payments.append(payment)
+                self._by_id[payment_id] = payment
+                self._by_lead[lead.get("id")].append(payment)
 
             # In a real implementation, this would create a payment link via Stripe or Razorpay API
             # For demonstration, we'll create a mock link
 
-            if country == "US":
-                # Format amount for US leads
-                formatted_amount = f"${amount}"
-                payment_link = f"https://example.com/payment/{payment_id}?amount={amount}&currency=USD"
+            payment_link = cfg["url_tpl"].format(id=payment_id, amt=amount)
 
-                self.logger.info(f"Created Stripe payment link for US lead: {payment_link}")
-            else:
-                # Format amount for India leads
-                formatted_amount = f"₹{amount}"
-                payment_link = f"https://example.com/payment/{payment_id}?amount={amount}&currency=INR"
-
-                self.logger.info(f"Created Razorpay payment link for India lead: {payment_link}")
+            self.logger.info("Created %s payment link for %s lead: %s", cfg["provider"], country, payment_link)
 
             return payment_link
 
         except Exception as e:
-            self.logger.error(f"Error creating payment link: {str(e)}")
+            self.logger.error("Error creating payment link: %s", e)
             raise
 
     def handle_webhook(self, data):
@@ -95,29 +121,44 @@ class PaymentService:
             bool: Success status
         """
         try:
-            self.logger.info(f"Handling payment webhook: {data}")
+            self.logger.info("Handling payment webhook: %s", data)
 
             # Extract payment data
             payment_id = data.get("payment_id")
             status = data.get("status")
 
-            # Find and update payment
-            payment = next((p for p in self.payments if p.get("id") == payment_id), None)
+            # Skip events that were already applied (providers redeliver on retry)
+            event_id = data.get("event_id") or hashlib.sha1(
+                f"{payment_id}:{status}:{data.get('timestamp', '')}".encode()
+            ).hexdigest()
 
-            if not payment:
-                self.logger.warning(f"Payment not found: {payment_id}")
-                return False
+            with self._lock:
+                if event_id in self._processed_events:
+                    self.logger.info("Skipping duplicate webhook event %s", event_id)
+                    return True
+
+                # Find and update payment
+                payment = self._by_id.get(payment_id)
 
-            # Update payment status
-            payment["status"] = status
-            payment["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                if not payment:
+                    self.logger.warning("Payment not found: %s", payment_id)
+                    return False
 
-            self.logger.info(f"Updated payment {payment_id} status to {status}")
+                # Update payment status
+                payment["status"] = status
+                payment["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+                self.logger.info("Updated payment %s status to %s", payment_id, status)
+
+                # Remember the event, evicting the oldest once full
+                self._processed_events[event_id] = None
+                if len(self._processed_events) > MAX_PROCESSED_EVENTS:
+                    self._processed_events.popitem(last=False)
 
             return True
 
         except Exception as e:
-            self.logger.error(f"Error handling payment webhook: {str(e)}")
+            self.logger.error("Error handling payment webhook: %s", e)
             return False
 
     def get_payment_details(self, payment_id):
@@ -132,16 +173,16 @@ class PaymentService:
         """
         try:
             # Find payment
-            payment = next((p for p in self.payments if p.get("id") == payment_id), None)
+            payment = self._by_id.get(payment_id)
 
             if not payment:
-                self.logger.warning(f"Payment not found: {payment_id}")
+                self.logger.warning("Payment not found: %s", payment_id)
                 return None
 
             return payment
 
         except Exception as e:
-            self.logger.error(f"Error getting payment details: {str(e)}")
+            self.logger.error("Error getting payment details: %s", e)
             return None
 
     def get_lead_payments(self, lead_id):
@@ -156,10 +197,8 @@ class PaymentService:
         """
         try:
             # Find payments for lead
-            payments = [p for p in self.payments if p.get("lead_id") == lead_id]
-
-            return payments
+            return list(self._by_lead.get(lead_id, []))
 
         except Exception as e:
-            self.logger.error(f"Error getting lead payments: {str(e)}")
+            self.logger.error("Error getting lead payments: %s", e)
             return []
@@ -1,24 +1,108 @@
 import os
 import logging
 import json
+import threading
+import uuid
+from itertools import islice
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from dotenv import load_dotenv
 
+# Local imports
+from services.cache import redis_memo, bump_version
+
 # Load environment variables
 load_dotenv()
 
+# Cache version keys
+LEADS_VERSION_KEY = "leads:v"
+
+def lead_version_key(lead_id):
+    """Version key for a single cached lead"""
+    return f"lead:v:{lead_id}"
+
+@dataclass(slots=True)
+class Lead:
+    """
+    Stored lead row; fields outside the sheet columns are kept in extra
+    """
+    id: str
+    first_name: str = ""
+    last_name: str = ""
+    email: str = ""
+    title: str = ""
+    company: str = ""
+    industry: str = ""
+    estimated_revenue: str = ""
+    country: str = ""
+    status: str = "New"
+    added_at: str = ""
+    updated_at: str = ""
+    notes: str = ""
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a lead from a lead dict"""
+        lead = cls(id=data.get("id"))
+        lead.merge(data)
+        return lead
+
+    def merge(self, data):
+        """Update fields from a lead dict, like dict.update"""
+        for key, value in data.items():
+            if key in LEAD_FIELD_SET:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+
+    def to_dict(self):
+        """Return the lead as a plain dict"""
+        data = {name: getattr(self, name) for name in LEAD_FIELDS}
+        data.update(self.extra)
+        return data
+
+LEAD_FIELDS = tuple(f.name for f in fields(Lead) if f.name != "extra")
+LEAD_FIELD_SET = frozenset(LEAD_FIELDS)
+
 class SheetsService:
     """
     Service for interacting with Google Sheets to store and retrieve lead data
     """
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.spreadsheet_id = os.environ.get("LEAD_SHEET_ID")
+
+        # Scopes Redis memo entries to this in-memory store, so other processes
+        # and earlier runs never serve leads this store does not hold
+        self.cache_namespace = uuid.uuid4().hex
 
         # In a real implementation, this would use Google Sheets API
         # For demonstration, we'll use in-memory storage
         self.leads_store = []
         self.lead_counter = 0
 
+        # Serializes writes to the lead store, its index and the analytics counters
+        self._lock = threading.Lock()
+
+        # Lead ID -> Lead (same objects as in leads_store)
+        self._index = {}
+
+        # Analytics kept up to date on every write
+        self._status_counts = {"US": Counter(), "IN": Counter()}
+        self._recent = OrderedDict()  # Lead IDs, least to most recently updated
+
+    def _count_lead(self, lead, delta):
+        """Add delta to the (country, status) counter for a lead"""
+        bucket = "US" if lead.country == 'US' else "IN"
+        self._status_counts[bucket][lead.status] += delta
+
+    def _touch_lead(self, lead_id):
+        """Mark a lead as the most recently updated"""
+        self._recent[lead_id] = None
+        self._recent.move_to_end(lead_id)
+
     def store_leads(self, leads):
         """
         Store leads in the spreadsheet
@@ -30,25 +114,49 @@ class SheetsService:
             bool: Success status
         """
         try:
-            self.logger.info(f"Storing {len(leads)} leads")
+            self.logger.info("Storing %s leads", len(leads))
 
-            # In a real implementation, this would add data to Google Sheets
+            # In a real implementation, this would write all rows to Google Sheets
+            # in a single values.batchUpdate call
             # For demonstration, we'll add to in-memory store
-            for lead in leads:
-                # Check if lead already exists
-                existing_lead = next((l for l in self.leads_store if l.get('id') == lead.get('id')), None)
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-                if existing_lead:
-                    # Update existing lead
-                    existing_lead.update(lead)
-                    existing_lead['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # Merge the batch by lead ID (later rows update earlier ones)
+            incoming = {}
+            for lead in leads:
+                lead_id = lead.get('id')
+                if lead_id in incoming:
+                    incoming[lead_id].update(lead)
                 else:
-                    # Add new lead
-                    lead['status'] = 'New'
-                    lead['added_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    lead['updated_at'] = lead['added_at']
-                    lead['notes'] = ''
-                    self.leads_store.append(lead)
+                    incoming[lead_id] = lead
+
+            with self._lock:
+                # Partition into updates and inserts in one set operation
+                to_update = incoming.keys() & self._index.keys()
+
+                for lead_id in to_update:
+                    existing_lead = self._index[lead_id]
+                    self._count_lead(existing_lead, -1)
+                    existing_lead.merge(incoming[lead_id])
+                    existing_lead.updated_at = now
+                    self._count_lead(existing_lead, 1)
+
+                new_leads = [Lead.from_dict(lead) for lead_id, lead in incoming.items() if lead_id not in to_update]
+                for lead in new_leads:
+                    lead.status = 'New'
+                    lead.added_at = now
+                    lead.updated_at = now
+                    lead.notes = ''
+                    self._count_lead(lead, 1)
+
+                self._index.update((lead.id, lead) for lead in new_leads)
+                self.leads_store.extend(new_leads)
+
+                for lead_id in incoming:
+                    self._touch_lead(lead_id)
+
+            # Invalidate cached reads
+            bump_version(self.cache_namespace, LEADS_VERSION_KEY, *(lead_version_key(lead_id) for lead_id in incoming))
 
             return True
 
@@ -56,6 +164,7 @@ class SheetsService:
             self.logger.error(f"Error storing leads: {str(e)}")
             return False
 
+    @redis_memo(ttl=300, version_key=lambda lead_ids=None: LEADS_VERSION_KEY)
     def get_leads(self, lead_ids=None):
         """
         Get leads from the spreadsheet
@@ -64,21 +173,22 @@ class SheetsService:
             lead_ids (list, optional): List of lead IDs to fetch. If None, returns all leads.
 
         Returns:
-            list: Lead objects
+            list: Lead dicts
         """
         try:
-            self.logger.info(f"Fetching leads: {lead_ids if lead_ids else 'all'}")
+            self.logger.info("Fetching leads: %s", lead_ids if lead_ids else 'all')
 
             if not lead_ids:
-                return self.leads_store
+                return [lead.to_dict() for lead in self.leads_store]
 
-            # Filter leads by ID
-            return [lead for lead in self.leads_store if lead.get('id') in lead_ids]
+            # Resolve all requested leads at once (one values.batchGet in a real implementation)
+            return [self._index[lead_id].to_dict() for lead_id in dict.fromkeys(lead_ids) if lead_id in self._index]
 
         except Exception as e:
             self.logger.error(f"Error getting leads: {str(e)}")
             return []
 
+    @redis_memo(ttl=300, version_key=lead_version_key)
     def get_lead(self, lead_id):
         """
         Get a single lead by ID
@@ -90,12 +200,11 @@ class SheetsService:
             dict: Lead object or None if not found
         """
         try:
-            self.logger.info(f"Fetching lead: {lead_id}")
+            self.logger.info("Fetching lead: %s", lead_id)
 
             # Find lead by ID
-            lead = next((l for l in self.leads_store if l.get('id') == lead_id), None)
-
-            return lead
+            lead = self._index.get(lead_id)
+            return lead.to_dict() if lead else None
 
         except Exception as e:
             self.logger.error(f"Error getting lead: {str(e)}")
@@ -114,24 +223,31 @@ class SheetsService:
             bool: Success status
         """
         try:
-            self.logger.info(f"Updating lead {lead_id}: status={status}, notes={notes}")
+            self.logger.info("Updating lead %s: status=%s, notes=%s", lead_id, status, notes)
 
-            # Find lead by ID
-            lead = next((l for l in self.leads_store if l.get('id') == lead_id), None)
+            with self._lock:
+                # Find lead by ID
+                lead = self._index.get(lead_id)
 
-            if not lead:
-                self.logger.warning(f"Lead not found: {lead_id}")
-                return False
+                if not lead:
+                    self.logger.warning("Lead not found: %s", lead_id)
+                    return False
 
-            # Update lead
-            lead['status'] = status
-            lead['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                # Update lead
+                self._count_lead(lead, -1)
+                lead.status = status
+                lead.updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._count_lead(lead, 1)
+                self._touch_lead(lead_id)
 
-            if notes:
-                if lead.get('notes'):
-                    lead['notes'] += f"\n{notes}"
-                else:
-                    lead['notes'] = notes
+                if notes:
+                    if lead.notes:
+                        lead.notes += f"\n{notes}"
+                    else:
+                        lead.notes = notes
+
+            # Invalidate cached reads
+            bump_version(self.cache_namespace, LEADS_VERSION_KEY, lead_version_key(lead_id))
 
             return True
 
@@ -149,52 +265,25 @@ class SheetsService:
         try:
             self.logger.info("Generating analytics data")
 
-            # Default structure
-            analytics = {
-                "us_leads": {
-                    "total": 0,
-                    "by_status": {}
-                },
-                "india_leads": {
-                    "total": 0,
-                    "by_status": {}
-                },
-                "recent_activities": []
-            }
-
-            # Process leads
-            for lead in self.leads_store:
-                # Determine country category
-                if lead.get('country') == 'US':
-                    analytics["us_leads"]["total"] += 1
-
-                    # Count by status
-                    status = lead.get('status', 'New')
-                    analytics["us_leads"]["by_status"][status] = analytics["us_leads"]["by_status"].get(status, 0) + 1
-                else:
-                    analytics["india_leads"]["total"] += 1
-
-                    # Count by status
-                    status = lead.get('status', 'New')
-                    analytics["india_leads"]["by_status"][status] = analytics["india_leads"]["by_status"].get(status, 0) + 1
-
-                # Add to recent activities if updated recently
-                if lead.get('updated_at'):
-                    activity = {
-                        "id": lead.get('id'),
-                        "name": f"{lead.get('first_name', '')} {lead.get('last_name', '')}",
-                        "company": lead.get('company', 'N/A'),
-                        "status": lead.get('status', 'New'),
-                        "country": lead.get('country', 'N/A'),
-                        "last_contact": lead.get('updated_at')
-                    }
-                    analytics["recent_activities"].append(activity)
-
-            # Sort recent activities by date (newest first)
-            analytics["recent_activities"].sort(key=lambda x: x.get('last_contact', ''), reverse=True)
-
-            # Limit to 10 most recent
-            analytics["recent_activities"] = analytics["recent_activities"][:10]
+            with self._lock:
+                # Project the running counters; no pass over the lead store
+                analytics = {
+                    "us_leads": self._status_summary("US"),
+                    "india_leads": self._status_summary("IN"),
+                    "recent_activities": []
+                }
+
+                # 10 most recently updated leads (newest first)
+                for lead_id in islice(reversed(self._recent), 10):
+                    lead = self._index[lead_id]
+                    analytics["recent_activities"].append({
+                        "id": lead.id,
+                        "name": f"{lead.first_name} {lead.last_name}",
+                        "company": lead.company or 'N/A',
+                        "status": lead.status,
+                        "country": lead.country or 'N/A',
+                        "last_contact": lead.updated_at
+                    })
 
             return analytics
 
@@ -205,3 +294,16 @@ class SheetsService:
                 "india_leads": {"total": 0, "by_status": {}},
                 "recent_activities": []
             }
+
+    def _status_summary(self, bucket):
+        """
+        Build the total/by_status summary for a country bucket
+
+        Args:
+            bucket (str): Country bucket (US or IN)
+
+        Returns:
+            dict: Lead totals by status
+        """
+        by_status = {status: count for status, count in self._status_counts[bucket].items() if count > 0}
+        return {"total": sum(by_status.values()), "by_status": by_status}
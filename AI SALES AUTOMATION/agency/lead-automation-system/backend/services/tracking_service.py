@@ -26,32 +26,32 @@ class TrackingService:
         Returns:
             dict: Analytics data
         """
+        return dict(self.iter_analytics())
+
+    def iter_analytics(self):
+        """
+        Generate sales funnel analytics section by section
+
+        Yields:
+            tuple: (section name, section data)
+        """
         try:
             # Get data from sheets service
             analytics_data = self.sheets_service.get_analytics_data()
+            yield "data", analytics_data
 
             # Calculate additional metrics
             metrics = self._calculate_metrics(analytics_data)
+            yield "metrics", metrics
 
             # Generate optimization suggestions
-            suggestions = self._generate_suggestions(analytics_data, metrics)
-
-            # Combine all data
-            result = {
-                "data": analytics_data,
-                "metrics": metrics,
-                "suggestions": suggestions,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            return result
+            yield "suggestions", self._generate_suggestions(analytics_data, metrics)
 
         except Exception as e:
             self.logger.error(f"Error getting analytics: {str(e)}")
-            return {
-                "error": str(e),
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            yield "error", str(e)
+
+        yield "timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def _calculate_metrics(self, analytics_data):
         """
@@ -291,7 +291,7 @@ class TrackingService:
             lead = self.sheets_service.get_lead(lead_id)
 
             if not lead:
-                self.logger.warning(f"Cannot track email open for unknown lead: {lead_id}")
+                self.logger.warning("Cannot track email open for unknown lead: %s", lead_id)
                 return False
 
             # Update lead notes
@@ -324,7 +324,7 @@ class TrackingService:
             lead = self.sheets_service.get_lead(lead_id)
 
             if not lead:
-                self.logger.warning(f"Cannot track link click for unknown lead: {lead_id}")
+                self.logger.warning("Cannot track link click for unknown lead: %s", lead_id)
                 return False
 
             # Update lead notes based on link type
@@ -0,0 +1,9 @@
+# Patch sockets before anything else imports them so outbound
+# Sheets/Apollo/SMTP/Stripe calls yield to other requests
+from gevent import monkey
+monkey.patch_all()
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()
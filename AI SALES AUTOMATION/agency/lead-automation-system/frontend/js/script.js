@@ -79,6 +79,10 @@ document.addEventListener('DOMContentLoaded', function() {
             return this.fetchAPI('/outreach/start', 'POST', { lead_ids: leadIds });
         },
 
+        async getOutreachStatus(groupId) {
+            return this.fetchAPI(`/outreach/status/${groupId}`);
+        },
+
         async updateLead(leadId, status, notes) {
             return this.fetchAPI('/lead/update', 'POST', {
                 lead_id: leadId,
@@ -387,7 +391,7 @@ document.addEventListener('DOMContentLoaded', function() {
             // Call API
             window.api.startOutreach(selectedLeads).then(result => {
                 if (result.success) {
-                    showNotification('success', `Outreach started for ${result.data.success} leads`);
+                    showNotification('success', `Outreach queued for ${result.data.queued} leads`);
 
                     // Reset checkboxes
                     document.querySelectorAll('.lead-select-checkbox:checked').forEach(checkbox => {
@@ -399,11 +403,8 @@ document.addEventListener('DOMContentLoaded', function() {
                     button.innerHTML = originalText;
                     button.disabled = true;
 
-                    // If any failed, show details
-                    if (result.data.failed > 0) {
-                        console.warn('Failed outreach:', result.data.leads.filter(l => l.status === 'Failed'));
-                        showNotification('warning', `${result.data.failed} leads could not be processed`);
-                    }
+                    // Poll the worker queue and show failure details once finished
+                    pollOutreachStatus(result.data.group_id);
                 } else {
                     throw new Error(result.error || 'Unknown error');
                 }
@@ -413,5 +414,24 @@ document.addEventListener('DOMContentLoaded', function() {
                 showNotification('error', error.message);
             });
         }
+
+        function pollOutreachStatus(groupId) {
+            window.api.getOutreachStatus(groupId).then(result => {
+                if (!result.success) {
+                    return;
+                }
+
+                if (!result.data.ready) {
+                    setTimeout(() => pollOutreachStatus(groupId), 2000);
+                    return;
+                }
+
+                // If any failed, show details
+                if (result.data.failed > 0) {
+                    console.warn('Failed outreach:', result.data.leads.filter(l => l.status === 'Failed'));
+                    showNotification('warning', `${result.data.failed} leads could not be processed`);
+                }
+            }).catch(() => {});
+        }
     }
 });
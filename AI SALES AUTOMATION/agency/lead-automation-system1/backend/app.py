@@ -1,9 +1,17 @@
 import os
 from flask import Flask, jsonify, request, render_template
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 import json
+import hmac
+import time
+import uuid
+import hashlib
+import orjson
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 
 # Load environment variables
 load_dotenv()
@@ -26,18 +34,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# JSON provider backed by orjson
+class OrjsonProvider(JSONProvider):
+    """
+    Serialize Flask JSON responses and parse request bodies with orjson
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__,
             static_folder='../frontend',
             template_folder='../frontend')
+app.json = OrjsonProvider(app)
 CORS(app)
 
-# Initialize services
+# Initialize services; one Sheets client and one email service are shared
 apollo_service = ApolloService()
-email_service = EmailService()
 sheets_service = SheetsService()
-payment_service = PaymentService()
-tracking_service = TrackingService()
+email_service = EmailService(sheets_service)
+payment_service = PaymentService(sheets_service, email_service)
+tracking_service = TrackingService(sheets_service)
+
+# Background executor for outreach and webhook work, so requests return
+# as soon as the job is accepted
+executor = ThreadPoolExecutor(max_workers=int(os.environ.get('BACKGROUND_WORKERS', 8)))
+
+# Job ID -> (future, submitted at); finished jobs nobody polls are dropped after this many seconds
+OUTREACH_JOB_TTL = 3600
+outreach_jobs = {}
+
+def prune_outreach_jobs():
+    """
+    Drop finished outreach jobs older than OUTREACH_JOB_TTL
+    """
+    cutoff = time.monotonic() - OUTREACH_JOB_TTL
+    for job_id, (future, submitted_at) in list(outreach_jobs.items()):
+        if future.done() and submitted_at < cutoff:
+            outreach_jobs.pop(job_id, None)
+
+# Webhook signature verification
+# Senders sign the raw request body with HMAC-SHA256 using WEBHOOK_SECRET
+WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET', '').encode()
+if not WEBHOOK_SECRET:
+    logger.warning("WEBHOOK_SECRET not set. Incoming webhooks will be rejected.")
+
+def webhook_signature_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # Verify the raw body before it is parsed or queued
+        if not WEBHOOK_SECRET:
+            return jsonify({"success": False, "error": "Invalid signature"}), 401
+
+        signature = request.headers.get('X-Signature', '').encode()
+        expected = hmac.new(WEBHOOK_SECRET, request.get_data(), hashlib.sha256).hexdigest().encode()
+        if not hmac.compare_digest(signature, expected):
+            return jsonify({"success": False, "error": "Invalid signature"}), 401
+
+        return f(*args, **kwargs)
+    return decorated_function
 
 # Routes
 @app.route('/')
@@ -67,6 +127,28 @@ def search_leads():
         logger.error(f"Error searching leads: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def run_outreach(lead_ids):
+    """
+    Fetch leads and start their campaign on a background thread
+    """
+    # Get leads from spreadsheet
+    leads = sheets_service.get_leads(lead_ids)
+
+    # Start outreach campaign
+    results = email_service.start_campaign(leads)
+
+    # Wait for the queued emails so the job reports what was actually sent
+    for lead_result, sent in results.pop("pending"):
+        if sent.result():
+            results["success"] += 1
+            lead_result["status"] = "Sent"
+        else:
+            results["failed"] += 1
+            lead_result["status"] = "Failed"
+            lead_result["reason"] = "Email could not be sent"
+
+    return results
+
 @app.route('/api/outreach/start', methods=['POST'])
 def start_outreach():
     """
@@ -76,17 +158,40 @@ def start_outreach():
         data = request.json
         lead_ids = data.get('lead_ids', [])
 
-        # Get leads from spreadsheet
-        leads = sheets_service.get_leads(lead_ids)
+        # Run the campaign in the background; clients poll the job status
+        prune_outreach_jobs()
+        job_id = str(uuid.uuid4())
+        outreach_jobs[job_id] = (executor.submit(run_outreach, lead_ids), time.monotonic())
 
-        # Start outreach campaign
-        results = email_service.start_campaign(leads)
-
-        return jsonify({"success": True, "data": results})
+        return jsonify({"success": True, "data": {"job_id": job_id}}), 202
     except Exception as e:
         logger.error(f"Error starting outreach: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/outreach/status/<job_id>', methods=['GET'])
+def outreach_status(job_id):
+    """
+    Get the status of a background outreach job
+    """
+    job = outreach_jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown outreach job"}), 404
+
+    future = job[0]
+
+    if not future.done():
+        return jsonify({"success": True, "data": {"ready": False}})
+
+    # Finished jobs are reported once, then forgotten
+    outreach_jobs.pop(job_id, None)
+
+    try:
+        results = future.result()
+        return jsonify({"success": True, "data": dict(results, ready=True)})
+    except Exception as e:
+        logger.error(f"Error getting outreach status: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/lead/update', methods=['POST'])
 def update_lead():
     """
@@ -144,27 +249,29 @@ def get_analytics():
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/webhook/email', methods=['POST'])
+@webhook_signature_required
 def email_webhook():
     """
     Handle email reply webhooks
     """
     try:
         data = request.json
-        email_service.handle_reply(data)
-        return jsonify({"success": True})
+        executor.submit(email_service.handle_reply, data)
+        return jsonify({"success": True}), 202
     except Exception as e:
         logger.error(f"Error handling email webhook: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/webhook/payment', methods=['POST'])
+@webhook_signature_required
 def payment_webhook():
     """
     Handle payment webhooks from Stripe/Razorpay
     """
     try:
         data = request.json
-        payment_service.handle_webhook(data)
-        return jsonify({"success": True})
+        executor.submit(payment_service.handle_webhook, data)
+        return jsonify({"success": True}), 202
     except Exception as e:
         logger.error(f"Error handling payment webhook: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1,7 +1,10 @@
 import os
 import requests
 import json
+import ijson
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,6 +20,21 @@ class ApolloService:
         self.base_url = 'https://api.apollo.io/v1'
         self.logger = logging.getLogger(__name__)
 
+        # Pooled HTTP session so repeated calls reuse the TLS connection.
+        # Apollo's search and match endpoints are read-only, so POSTs are
+        # safe to retry on rate limits and server errors.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["POST"])
+            )
+        ))
+
         if not self.api_key:
             self.logger.warning("Apollo API key not set. Lead generation functionality will be limited.")
 
@@ -33,7 +51,29 @@ class ApolloService:
         Returns:
             list: List of lead data
         """
-        self.logger.info(f"Searching leads in {country}, industry: {industry}, revenue: {revenue}")
+        leads = list(self.iter_leads(country, industry, revenue, limit))
+
+        self.logger.info("Found %s leads in %s", len(leads), country)
+        return leads
+
+    def iter_leads(self, country, industry=None, revenue=None, limit=100):
+        """
+        Stream leads from an Apollo.io search
+
+        The response body is parsed incrementally, so each lead is yielded
+        as soon as its person object has been read and the full payload is
+        never held in memory.
+
+        Args:
+            country (str): Country to target (US or IN)
+            industry (str, optional): Industry to target
+            revenue (str, optional): Revenue range to target
+            limit (int, optional): Maximum number of leads to return
+
+        Yields:
+            dict: Lead data
+        """
+        self.logger.info("Searching leads in %s, industry: %s, revenue: %s", country, industry, revenue)
 
         # Build search query
         query = {
@@ -68,50 +108,60 @@ class ApolloService:
 
         try:
             # Make API request
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/mixed_people/search",
-                json=query
+                json=query,
+                stream=True
             )
 
             # Check for errors
             response.raise_for_status()
 
-            # Parse response
-            data = response.json()
-
-            if "people" not in data:
-                self.logger.error(f"Invalid response from Apollo API: {data}")
-                return []
-
-            # Extract and format lead data
-            leads = []
-            for person in data["people"]:
-                # Extract organization
-                org = person.get("organization", {})
-
-                # Create lead object
-                lead = {
-                    "id": person.get("id"),
-                    "first_name": person.get("first_name", ""),
-                    "last_name": person.get("last_name", ""),
-                    "email": person.get("email", ""),
-                    "phone": person.get("phone_number", ""),
-                    "linkedin_url": person.get("linkedin_url", ""),
-                    "title": person.get("title", ""),
-                    "company": org.get("name", ""),
-                    "company_website": org.get("website_url", ""),
-                    "industry": org.get("industry", ""),
-                    "company_size": org.get("employee_count", ""),
-                    "country": country,
-                    "estimated_revenue": org.get("estimated_annual_revenue", ""),
-                    "status": "New",
-                    "source": "Apollo.io",
-                    "notes": ""
-                }
-                leads.append(lead)
-
-            self.logger.info(f"Found {len(leads)} leads in {country}")
-            return leads
+            # Parse people one at a time straight off the socket, noting
+            # whether the people array and any top-level error text appear
+            response.raw.decode_content = True
+            found = {"people": False}
+            messages = []
+
+            def watch(events):
+                for prefix, event, value in events:
+                    if prefix == "people" and event == "start_array":
+                        found["people"] = True
+                    elif prefix in ("error", "message") and event == "string":
+                        messages.append(value)
+                    yield prefix, event, value
+
+            people = ijson.items(watch(ijson.parse(response.raw, use_float=True)), "people.item")
+
+            try:
+                for person in people:
+                    # Extract organization
+                    org = person.get("organization") or {}
+
+                    # Create lead object
+                    yield {
+                        "id": person.get("id"),
+                        "first_name": person.get("first_name", ""),
+                        "last_name": person.get("last_name", ""),
+                        "email": person.get("email", ""),
+                        "phone": person.get("phone_number", ""),
+                        "linkedin_url": person.get("linkedin_url", ""),
+                        "title": person.get("title", ""),
+                        "company": org.get("name", ""),
+                        "company_website": org.get("website_url", ""),
+                        "industry": org.get("industry", ""),
+                        "company_size": org.get("employee_count", ""),
+                        "country": country,
+                        "estimated_revenue": org.get("estimated_annual_revenue", ""),
+                        "status": "New",
+                        "source": "Apollo.io",
+                        "notes": ""
+                    }
+
+                if not found["people"]:
+                    self.logger.error("Invalid response from Apollo API: no people array (%s)", "; ".join(messages) or "no error message")
+            finally:
+                response.close()
 
         except requests.RequestException as e:
             self.logger.error(f"Error connecting to Apollo API: {str(e)}")
@@ -144,7 +194,7 @@ class ApolloService:
             query["linkedin_url"] = linkedin_url
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/people/match",
                 json=query
             )
@@ -153,7 +203,7 @@ class ApolloService:
             data = response.json()
 
             if "person" not in data:
-                self.logger.warning(f"No enrichment data found: {data}")
+                self.logger.warning("No enrichment data found: %s", data)
                 return None
 
             # Extract and return enriched data
@@ -1,14 +1,20 @@
 import os
+import re
 import smtplib
 import logging
 import json
 import time
-import schedule
+import heapq
+import queue
 import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from types import MappingProxyType
+from jinja2 import Environment
 
 # Local imports
 from services.sheets_service import SheetsService
@@ -16,14 +22,209 @@ from services.sheets_service import SheetsService
 # Load environment variables
 load_dotenv()
 
+# SMTP connection reuse limits; providers cap messages per session
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get('SMTP_MAX_MESSAGES_PER_CONNECTION', 100))
+SMTP_IDLE_CHECK_SECONDS = 30
+
+# Parallel mail workers, each with its own SMTP sessions (Gmail allows ~15)
+SMTP_CONCURRENCY = int(os.environ.get('SMTP_CONCURRENCY', 5))
+
+# Transient SMTP replies retried with exponential backoff
+SMTP_TRANSIENT_CODES = frozenset([421, 450, 451, 452])
+SMTP_MAX_RETRIES = 3
+
+# Sheet status updates from sent emails are written in batches of up to this size
+SHEETS_UPDATE_BATCH_SIZE = 100
+
+# Reply keywords indicating interest in a call, matched in one pass
+_CALL_KEYWORD_RE = re.compile(r"\b(?:call|meeting|schedule|calendly|available|time)\b", re.IGNORECASE)
+
+# Time between the emails of a campaign
+FOLLOW_UP_INTERVAL = timedelta(days=3)
+
+# Active campaigns are saved here so follow-ups survive a restart
+CAMPAIGN_STATE_PATH = os.environ.get(
+    'CAMPAIGN_STATE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'campaign_state.json')
+)
+
+# Campaign fields stored as ISO 8601 strings in the state file
+_CAMPAIGN_DATETIME_FIELDS = ("last_contact", "next_follow_up")
+
+# Follow-ups are sent in batches; a run stops once at least a batch has
+# been attempted and a third or more of the sends failed
+FOLLOW_UP_BATCH_SIZE = 30
+
+# Seconds before the email -> lead index is rebuilt from the sheet
+LEAD_INDEX_TTL = 60
+
+# Subjects are plain text; bodies are HTML, so lead values are escaped there
+_SUBJECT_ENV = Environment(autoescape=False)
+_BODY_ENV = Environment(autoescape=True)
+
+# These would typically be loaded from a database or template files
+# For simplicity, we'll define them here
+EMAIL_TEMPLATES = {
+    "initial": {
+        "us": {
+            "subject": "Quick question about {{company}}",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>I noticed you're the owner of {{company}} and I wanted to reach out.</p>
+            <p>We've been helping {{business_type}} like yours streamline their operations and increase revenue.</p>
+            <p>Would you be interested in a quick 15-minute chat to see if we could help you too?</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Regarding your business: {{company}}",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>I came across {{company}} while researching leading {{business_type}} in {{country}}.</p>
+            <p>Our company specializes in helping businesses like yours increase efficiency and growth.</p>
+            <p>Would you be open to a brief conversation about how we might help your business?</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    },
+    "follow_up_1": {
+        "us": {
+            "subject": "Following up: {{company}}",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>I wanted to follow up on my previous email about how we could help {{company}}.</p>
+            <p>Many {{business_type}} owners we work with have seen significant improvements in just a few weeks.</p>
+            <p>Would you be available for a quick call this week?</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Quick follow-up: {{company}}",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>I'm following up on my previous message regarding {{company}}.</p>
+            <p>We've helped several {{business_type}} in India achieve remarkable results recently.</p>
+            <p>Would you like to schedule a short call to discuss how we could help you too?</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    },
+    "follow_up_2": {
+        "us": {
+            "subject": "One more thing about {{company}}",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>I thought I'd share that we recently helped a {{business_type}} similar to {{company}} increase their revenue by 30%.</p>
+            <p>I'd love to show you how we did it in a quick call.</p>
+            <p>Let me know if you're interested!</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Case study for {{company}}",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>I wanted to share a case study about how we helped a {{business_type}} in India similar to {{company}}.</p>
+            <p>They were facing challenges with growth, and we helped them implement solutions that increased their revenue.</p>
+            <p>Would you like to see how we could apply similar strategies to your business?</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    },
+    "follow_up_3": {
+        "us": {
+            "subject": "Final thoughts for {{company}}",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>I've reached out a few times about how we could help {{company}} grow as a {{business_type}}.</p>
+            <p>I understand you might be busy, so this will be my last email for now.</p>
+            <p>If you'd like to explore how we could work together in the future, please feel free to reach out.</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Last message regarding {{company}}",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>I've sent a few messages about how we could support {{company}} as a growing {{business_type}} in India.</p>
+            <p>This will be my last email, but please know my offer to help still stands.</p>
+            <p>Whenever you're ready to discuss, I'm here to help.</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    },
+    "call_invite": {
+        "us": {
+            "subject": "Call details for our discussion",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>Thank you for your interest in discussing how we can help {{company}}.</p>
+            <p>You can book a time on my calendar here: <a href="{{calendly_link}}">Schedule a Call</a></p>
+            <p>I look forward to our conversation!</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Schedule our call",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>Thanks for your interest in exploring how we can help {{company}} grow.</p>
+            <p>Please use this link to book a time that works for you: <a href="{{calendly_link}}">Book a Call</a></p>
+            <p>I'm looking forward to our discussion!</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    },
+    "pricing_info": {
+        "us": {
+            "subject": "Investment details for {{company}}",
+            "body": """
+            <p>Hi {{first_name}},</p>
+            <p>Thank you for your interest in our services for {{company}}.</p>
+            <p>Based on our discussion, the investment for our solution would be ${{price}}.</p>
+            <p>You can make the payment securely through this link: <a href="{{payment_link}}">Make Payment</a></p>
+            <p>Once the payment is confirmed, we'll begin the onboarding process right away.</p>
+            <p>Best regards,<br>Your Name</p>
+            """
+        },
+        "india": {
+            "subject": "Pricing information for {{company}}",
+            "body": """
+            <p>Hello {{first_name}},</p>
+            <p>Thank you for considering our services for {{company}}.</p>
+            <p>The investment for our solution would be ₹{{price}}.</p>
+            <p>You can complete the payment through this secure link: <a href="{{payment_link}}">Make Payment</a></p>
+            <p>After payment confirmation, we'll start the onboarding process immediately.</p>
+            <p>Regards,<br>Your Name</p>
+            """
+        }
+    }
+}
+
+# Templates compiled once at import, keyed by (sequence_type, locale);
+# read-only so no caller can mutate the shared templates
+_TEMPLATE_CACHE = MappingProxyType({
+    (sequence_type, locale): MappingProxyType({
+        "subject": _SUBJECT_ENV.from_string(template["subject"]),
+        "body": _BODY_ENV.from_string(template["body"])
+    })
+    for sequence_type, locales in EMAIL_TEMPLATES.items()
+    for locale, template in locales.items()
+})
+
+@lru_cache(maxsize=64)
+def _compile_body(template):
+    """Compile an ad-hoc HTML body template, caching by its text"""
+    return _BODY_ENV.from_string(template)
+
 class EmailService:
     """
     Service for handling automated email outreach to leads
     """
 
-    def __init__(self):
+    def __init__(self, sheets_service=None):
         self.logger = logging.getLogger(__name__)
-        self.sheets_service = SheetsService()
+        self.sheets_service = sheets_service or SheetsService()
 
         # Email credentials
         self.gmail_username = os.environ.get('GMAIL_USERNAME')
@@ -31,31 +232,190 @@ class EmailService:
         self.outlook_email = os.environ.get('OUTLOOK_EMAIL')
         self.outlook_password = os.environ.get('OUTLOOK_PASSWORD')
 
+        # Pooled SMTP connections, one per country per sending thread
+        self._smtp_local = threading.local()
+
         # Calendly link
         self.calendly_link = os.environ.get('CALENDLY_LINK', 'https://calendly.com/yourusername')
 
-        # Campaign tracking
-        self.active_campaigns = {}
+        # Email -> lead index for matching replies, rebuilt every LEAD_INDEX_TTL
+        self._email_to_lead = {}
+        self._email_index_ts = 0
+        self._email_index_lock = threading.Lock()
+
+        # Campaign tracking; the heap holds (next_follow_up, lead_id) so
+        # only due campaigns are visited on each follow-up run
+        self._state_path = CAMPAIGN_STATE_PATH
+        self._state_lock = threading.Lock()
+        self.active_campaigns = self._load_campaign_state()
+        self._follow_up_heap = [
+            (campaign["next_follow_up"], lead_id)
+            for lead_id, campaign in self.active_campaigns.items()
+        ]
+        heapq.heapify(self._follow_up_heap)
+        self._follow_up_lock = threading.Lock()
         self.follow_up_thread = None
 
-        # Start follow-up scheduler
+        # Outgoing mail queue, drained by background workers
+        self._mail_queue = queue.Queue()
+        self.mail_threads = []
+
+        # Sheet updates for sent emails, flushed in one batchUpdate
+        self._pending_updates = []
+        self._pending_updates_lock = threading.Lock()
+
+        # Start follow-up scheduler and mail workers
         self._start_follow_up_scheduler()
+        self._start_mail_worker()
+
+    def _load_campaign_state(self):
+        """
+        Load active campaigns saved by a previous run
+
+        Returns:
+            dict: Active campaigns by lead ID
+        """
+        if not os.path.exists(self._state_path):
+            return {}
+
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                campaigns = json.load(f)
+            for campaign in campaigns.values():
+                for field in _CAMPAIGN_DATETIME_FIELDS:
+                    campaign[field] = datetime.fromisoformat(campaign[field])
+            self.logger.info("Loaded %s active campaigns", len(campaigns))
+            return campaigns
+        except Exception as e:
+            self.logger.error("Error loading campaign state: %s", e)
+            return {}
+
+    def _save_campaign_state(self):
+        """Save active campaigns, replacing the previous file atomically"""
+        try:
+            with self._state_lock:
+                campaigns = {
+                    lead_id: dict(campaign, **{
+                        field: campaign[field].isoformat() for field in _CAMPAIGN_DATETIME_FIELDS
+                    })
+                    for lead_id, campaign in self.active_campaigns.items()
+                }
+
+                tmp_path = f"{self._state_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(campaigns, f)
+                os.replace(tmp_path, self._state_path)
+        except Exception as e:
+            self.logger.error("Error saving campaign state: %s", e)
 
     def _start_follow_up_scheduler(self):
         """Start the scheduler for follow-up emails"""
-        def run_scheduler():
-            # Schedule follow-ups to run every day at 10 AM
-            schedule.every().day.at("10:00").do(self._process_follow_ups)
-
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
+        self._schedule_next_follow_up()
+        self.logger.info("Follow-up scheduler started")
 
-        # Start scheduler in a separate thread
-        self.follow_up_thread = threading.Thread(target=run_scheduler)
+    def _schedule_next_follow_up(self):
+        """Arm a timer that fires at the next 10 AM follow-up run"""
+        now = datetime.now()
+        next_run = now.replace(hour=10, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+
+        # Sleep until the run instead of polling every minute
+        self.follow_up_thread = threading.Timer(
+            (next_run - now).total_seconds(),
+            self._run_follow_ups
+        )
         self.follow_up_thread.daemon = True
         self.follow_up_thread.start()
-        self.logger.info("Follow-up scheduler started")
+
+    def _run_follow_ups(self):
+        """Process follow-ups, then re-arm the timer for the next day"""
+        try:
+            self._process_follow_ups()
+        except Exception as e:
+            self.logger.error("Error processing follow-ups: %s", e)
+        finally:
+            self._schedule_next_follow_up()
+
+    def _start_mail_worker(self):
+        """Start the background workers that send queued emails"""
+        def run_worker():
+            while True:
+                to_email, subject, html_content, country, on_sent, future = self._mail_queue.get()
+                sent = False
+                try:
+                    sent = self._send_email(to_email, subject, html_content, country)
+                    if sent and on_sent:
+                        on_sent()
+                except Exception as e:
+                    self.logger.error("Error processing queued email to %s: %s", to_email, e)
+                finally:
+                    future.set_result(sent)
+                    self._mail_queue.task_done()
+
+                # Write the sheet updates and campaigns for a drained queue at once.
+                # Campaigns are saved even if a full batch already flushed the updates.
+                if self._mail_queue.empty():
+                    self._flush_lead_updates()
+                    self._save_campaign_state()
+
+        # Each worker thread keeps its own SMTP sessions open between sends
+        for i in range(SMTP_CONCURRENCY):
+            mail_thread = threading.Thread(target=run_worker, name=f"mail-worker-{i}")
+            mail_thread.daemon = True
+            mail_thread.start()
+            self.mail_threads.append(mail_thread)
+        self.logger.info("Started %s mail workers", SMTP_CONCURRENCY)
+
+    def _queue_email(self, to_email, subject, html_content, country, on_sent=None):
+        """
+        Queue an email for the background mail workers
+
+        Args:
+            to_email (str): Recipient email
+            subject (str): Email subject
+            html_content (str): Email HTML content
+            country (str): Lead country (US or IN)
+            on_sent (callable, optional): Called after the email is sent successfully
+
+        Returns:
+            Future: Resolves to True once the email is sent, False if it failed
+        """
+        future = Future()
+        self._mail_queue.put((to_email, subject, html_content, country, on_sent, future))
+        return future
+
+    def _record_lead_update(self, lead_id, status, notes=""):
+        """
+        Buffer a sheet update until the mail queue drains or the batch is full
+
+        Args:
+            lead_id (str): Lead ID to update
+            status (str): New status
+            notes (str, optional): Notes to append
+        """
+        with self._pending_updates_lock:
+            self._pending_updates.append((lead_id, status, notes))
+            full = len(self._pending_updates) >= SHEETS_UPDATE_BATCH_SIZE
+
+        if full:
+            self._flush_lead_updates()
+
+    def _flush_lead_updates(self):
+        """
+        Write all buffered sheet updates with a single batch update
+
+        Returns:
+            bool: Whether there were updates to write
+        """
+        with self._pending_updates_lock:
+            updates, self._pending_updates = self._pending_updates, []
+
+        if not updates:
+            return False
+
+        self.sheets_service.batch_update_leads(updates)
+        return True
 
     def _get_smtp_connection(self, country):
         """
@@ -84,6 +444,75 @@ class EmailService:
                 "password": self.gmail_password
             }
 
+    def _smtp_pool(self):
+        """
+        Get the calling thread's SMTP pool
+
+        Returns:
+            threading.local: Per-thread conns, sent and last_used dicts
+        """
+        pool = self._smtp_local
+        if not hasattr(pool, "conns"):
+            pool.conns = {}
+            pool.sent = {}
+            pool.last_used = {}
+        return pool
+
+    def _get_connection(self, country):
+        """
+        Get a pooled, logged-in SMTP connection for a country
+
+        Reuses the calling thread's connection across a batch of sends, so
+        the TLS handshake and login happen once rather than per email.
+        Connections idle for a while are checked with NOOP first, and each
+        is rotated after SMTP_MAX_MESSAGES_PER_CONNECTION messages.
+
+        Args:
+            country (str): Lead country (US or IN)
+
+        Returns:
+            smtplib.SMTP: Connected SMTP session
+        """
+        pool = self._smtp_pool()
+        key = "US" if country == "US" else "IN"
+        conn = pool.conns.get(key)
+
+        if conn is not None and pool.sent.get(key, 0) < SMTP_MAX_MESSAGES_PER_CONNECTION:
+            # Back-to-back sends skip the NOOP round trip
+            if time.monotonic() - pool.last_used.get(key, 0) < SMTP_IDLE_CHECK_SECONDS:
+                return conn
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except smtplib.SMTPException:
+                pass
+
+        if conn is not None:
+            self._close_connection(key)
+
+        smtp_config = self._get_smtp_connection(country)
+        conn = smtplib.SMTP(smtp_config["server"], smtp_config["port"])
+        conn.starttls()
+        conn.login(smtp_config["username"], smtp_config["password"])
+
+        pool.conns[key] = conn
+        pool.sent[key] = 0
+        return conn
+
+    def _close_connection(self, key):
+        """
+        Drop one of the calling thread's pooled SMTP connections
+
+        Args:
+            key (str): Pool key (US or IN)
+        """
+        conn = self._smtp_pool().conns.pop(key, None)
+        if conn is not None:
+            try:
+                conn.quit()
+            except Exception:
+                conn.close()
+
     def _send_email(self, to_email, subject, html_content, country):
         """
         Send an email
@@ -109,184 +538,68 @@ class EmailService:
         # Add HTML content
         msg.attach(MIMEText(html_content, 'html'))
 
-        try:
-            # Connect to SMTP server
-            server = smtplib.SMTP(smtp_config["server"], smtp_config["port"])
-            server.starttls()
-            server.login(smtp_config["username"], smtp_config["password"])
-
-            # Send email
-            server.sendmail(smtp_config["username"], to_email, msg.as_string())
-            server.quit()
+        key = "US" if country == "US" else "IN"
+        pool = self._smtp_pool()
 
-            self.logger.info(f"Email sent to {to_email}")
+        try:
+            for attempt in range(SMTP_MAX_RETRIES + 1):
+                try:
+                    try:
+                        server = self._get_connection(country)
+                        server.sendmail(smtp_config["username"], to_email, msg.as_string())
+                    except smtplib.SMTPServerDisconnected:
+                        # Pooled connection went stale, reconnect and retry once
+                        self._close_connection(key)
+                        server = self._get_connection(country)
+                        server.sendmail(smtp_config["username"], to_email, msg.as_string())
+                    break
+                except smtplib.SMTPResponseException as e:
+                    # Back off on throttling / temporary failures, fail fast otherwise
+                    if e.smtp_code not in SMTP_TRANSIENT_CODES or attempt == SMTP_MAX_RETRIES:
+                        raise
+                    self._close_connection(key)
+                    time.sleep(2 ** attempt)
+
+            pool.sent[key] += 1
+            pool.last_used[key] = time.monotonic()
+
+            self.logger.info("Email sent to %s", to_email)
             return True
         except Exception as e:
-            self.logger.error(f"Error sending email to {to_email}: {str(e)}")
+            self.logger.error("Error sending email to %s: %s", to_email, e)
             return False
 
-    def _get_email_templates(self, sequence_type):
+    def _get_email_template(self, sequence_type, locale):
         """
-        Get email templates for a sequence
+        Get the compiled email template for a sequence
 
         Args:
             sequence_type (str): Sequence type (initial, follow_up_1, etc.)
+            locale (str): Template set (us or india)
 
         Returns:
-            dict: Template data with subject and body
-        """
-        # These would typically be loaded from a database or template files
-        # For simplicity, we'll define them here
-        templates = {
-            "initial": {
-                "us": {
-                    "subject": "Quick question about {{company}}",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>I noticed you're the owner of {{company}} and I wanted to reach out.</p>
-                    <p>We've been helping {{business_type}} like yours streamline their operations and increase revenue.</p>
-                    <p>Would you be interested in a quick 15-minute chat to see if we could help you too?</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Regarding your business: {{company}}",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>I came across {{company}} while researching leading {{business_type}} in {{country}}.</p>
-                    <p>Our company specializes in helping businesses like yours increase efficiency and growth.</p>
-                    <p>Would you be open to a brief conversation about how we might help your business?</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            },
-            "follow_up_1": {
-                "us": {
-                    "subject": "Following up: {{company}}",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>I wanted to follow up on my previous email about how we could help {{company}}.</p>
-                    <p>Many {{business_type}} owners we work with have seen significant improvements in just a few weeks.</p>
-                    <p>Would you be available for a quick call this week?</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Quick follow-up: {{company}}",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>I'm following up on my previous message regarding {{company}}.</p>
-                    <p>We've helped several {{business_type}} in India achieve remarkable results recently.</p>
-                    <p>Would you like to schedule a short call to discuss how we could help you too?</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            },
-            "follow_up_2": {
-                "us": {
-                    "subject": "One more thing about {{company}}",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>I thought I'd share that we recently helped a {{business_type}} similar to {{company}} increase their revenue by 30%.</p>
-                    <p>I'd love to show you how we did it in a quick call.</p>
-                    <p>Let me know if you're interested!</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Case study for {{company}}",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>I wanted to share a case study about how we helped a {{business_type}} in India similar to {{company}}.</p>
-                    <p>They were facing challenges with growth, and we helped them implement solutions that increased their revenue.</p>
-                    <p>Would you like to see how we could apply similar strategies to your business?</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            },
-            "follow_up_3": {
-                "us": {
-                    "subject": "Final thoughts for {{company}}",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>I've reached out a few times about how we could help {{company}} grow as a {{business_type}}.</p>
-                    <p>I understand you might be busy, so this will be my last email for now.</p>
-                    <p>If you'd like to explore how we could work together in the future, please feel free to reach out.</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Last message regarding {{company}}",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>I've sent a few messages about how we could support {{company}} as a growing {{business_type}} in India.</p>
-                    <p>This will be my last email, but please know my offer to help still stands.</p>
-                    <p>Whenever you're ready to discuss, I'm here to help.</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            },
-            "call_invite": {
-                "us": {
-                    "subject": "Call details for our discussion",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>Thank you for your interest in discussing how we can help {{company}}.</p>
-                    <p>You can book a time on my calendar here: <a href="{{calendly_link}}">Schedule a Call</a></p>
-                    <p>I look forward to our conversation!</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Schedule our call",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>Thanks for your interest in exploring how we can help {{company}} grow.</p>
-                    <p>Please use this link to book a time that works for you: <a href="{{calendly_link}}">Book a Call</a></p>
-                    <p>I'm looking forward to our discussion!</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            },
-            "pricing_info": {
-                "us": {
-                    "subject": "Investment details for {{company}}",
-                    "body": """
-                    <p>Hi {{first_name}},</p>
-                    <p>Thank you for your interest in our services for {{company}}.</p>
-                    <p>Based on our discussion, the investment for our solution would be ${{price}}.</p>
-                    <p>You can make the payment securely through this link: <a href="{{payment_link}}">Make Payment</a></p>
-                    <p>Once the payment is confirmed, we'll begin the onboarding process right away.</p>
-                    <p>Best regards,<br>Your Name</p>
-                    """
-                },
-                "india": {
-                    "subject": "Pricing information for {{company}}",
-                    "body": """
-                    <p>Hello {{first_name}},</p>
-                    <p>Thank you for considering our services for {{company}}.</p>
-                    <p>The investment for our solution would be ₹{{price}}.</p>
-                    <p>You can complete the payment through this secure link: <a href="{{payment_link}}">Make Payment</a></p>
-                    <p>After payment confirmation, we'll start the onboarding process immediately.</p>
-                    <p>Regards,<br>Your Name</p>
-                    """
-                }
-            }
-        }
+            dict: Compiled subject and body templates
+        """
+        template = _TEMPLATE_CACHE.get((sequence_type, locale))
+        if template is None:
+            if (sequence_type, "us") not in _TEMPLATE_CACHE:
+                sequence_type = "initial"
+            template = _TEMPLATE_CACHE.get((sequence_type, locale), _TEMPLATE_CACHE[(sequence_type, "us")])
 
-        return templates.get(sequence_type, templates["initial"])
+        return template
 
-    def _personalize_template(self, template, lead):
+    def _normalize_lead(self, lead):
         """
-        Personalize an email template with lead data
+        Derive the per-lead values every email needs, without changing the lead
 
         Args:
-            template (str): Email template
             lead (dict): Lead data
 
         Returns:
-            str: Personalized template
+            tuple: (template set "us" or "india", business type)
         """
+        country_code = "us" if lead.get("country") == "US" else "india"
+
         # Determine business type based on industry
         business_type = lead.get("industry", "business")
         if not business_type or business_type.lower() == "n/a":
@@ -299,28 +612,70 @@ class EmailService:
             else:
                 business_type = "business"
 
-        # Replacements
-        replacements = {
-            "{{first_name}}": lead.get("first_name", "there"),
-            "{{last_name}}": lead.get("last_name", ""),
-            "{{company}}": lead.get("company", "your business"),
-            "{{business_type}}": business_type,
-            "{{country}}": "the United States" if lead.get("country") == "US" else "India",
-            "{{calendly_link}}": self.calendly_link,
-            "{{payment_link}}": lead.get("payment_link", "#")
+        return country_code, business_type
+
+    def _template_context(self, lead):
+        """
+        Build the template variables for a lead
+
+        Args:
+            lead (dict): Lead data
+
+        Returns:
+            dict: Template variables
+        """
+        _, business_type = self._normalize_lead(lead)
+
+        return {
+            "first_name": lead.get("first_name", "there"),
+            "last_name": lead.get("last_name", ""),
+            "company": lead.get("company", "your business"),
+            "business_type": business_type,
+            "country": "the United States" if lead.get("country") == "US" else "India",
+            "calendly_link": self.calendly_link,
+            "payment_link": lead.get("payment_link", "#"),
+            "price": lead.get("price", "")
         }
 
-        # Apply replacements
-        personalized = template
-        for key, value in replacements.items():
-            personalized = personalized.replace(key, value)
+    def _personalize_template(self, template, lead):
+        """
+        Personalize an email template with lead data
 
-        return personalized
+        Args:
+            template (Template or str): Compiled template, or HTML body text
+            lead (dict): Lead data
+
+        Returns:
+            str: Personalized template
+        """
+        if isinstance(template, str):
+            template = _compile_body(template)
+
+        return template.render(self._template_context(lead))
+
+    def _personalize_email(self, template_data, lead):
+        """
+        Render the subject and body of a compiled template for a lead
+
+        Args:
+            template_data (dict): Compiled subject and body templates
+            lead (dict): Lead data
+
+        Returns:
+            tuple: (subject, body)
+        """
+        context = self._template_context(lead)
+        return template_data["subject"].render(context), template_data["body"].render(context)
 
     def start_campaign(self, leads):
         """
         Start email outreach campaign for leads
 
+        Emails are queued for the background mail worker, so this returns
+        without waiting on SMTP. Queued leads are listed in results["pending"]
+        as (lead result, Future) pairs; callers wait on the futures and count
+        each lead as sent or failed.
+
         Args:
             leads (list): List of lead objects
 
@@ -330,7 +685,8 @@ class EmailService:
         results = {
             "success": 0,
             "failed": 0,
-            "leads": []
+            "leads": [],
+            "pending": []
         }
 
         for lead in leads:
@@ -339,7 +695,7 @@ class EmailService:
             country = lead.get("country")
 
             if not email:
-                self.logger.warning(f"No email for lead {lead_id}, skipping")
+                self.logger.warning("No email for lead %s, skipping", lead_id)
                 results["failed"] += 1
                 results["leads"].append({
                     "id": lead_id,
@@ -348,115 +704,197 @@ class EmailService:
                 })
                 continue
 
-            # Determine country template set
-            country_code = "us" if country == "US" else "india"
-
-            # Get email template
-            templates = self._get_email_templates("initial")
-            template_data = templates.get(country_code, templates["us"])
+            # Get template for the lead's country
+            template_data = self._get_email_template("initial", self._normalize_lead(lead)[0])
 
             # Personalize subject and body
-            subject = self._personalize_template(template_data["subject"], lead)
-            body = self._personalize_template(template_data["body"], lead)
+            subject, body = self._personalize_email(template_data, lead)
 
-            # Send email
-            success = self._send_email(email, subject, body, country)
+            # Queue email; the campaign starts once it has been sent
+            sent = self._queue_email(email, subject, body, country,
+                                     on_sent=lambda lead=lead: self._on_initial_email_sent(lead))
 
-            if success:
-                # Update lead status
-                self.sheets_service.update_lead(
-                    lead_id,
-                    "Initial Contact",
-                    "Initial email sent"
-                )
+            lead_result = {
+                "id": lead_id,
+                "status": "Queued"
+            }
+            results["leads"].append(lead_result)
+            results["pending"].append((lead_result, sent))
 
-                # Add to active campaigns
-                self.active_campaigns[lead_id] = {
-                    "lead": lead,
-                    "sequence": "initial",
-                    "last_contact": datetime.now(),
-                    "follow_up_count": 0,
-                    "max_follow_ups": 3,
-                    "next_follow_up": datetime.now() + timedelta(days=3)
-                }
+        return results
 
-                results["success"] += 1
-                results["leads"].append({
-                    "id": lead_id,
-                    "status": "Success",
-                    "next_follow_up": self.active_campaigns[lead_id]["next_follow_up"].strftime("%Y-%m-%d")
-                })
-            else:
-                results["failed"] += 1
-                results["leads"].append({
-                    "id": lead_id,
-                    "status": "Failed",
-                    "reason": "Email sending failed"
-                })
+    def _on_initial_email_sent(self, lead):
+        """
+        Record a started campaign after its initial email is sent
 
-        return results
+        Args:
+            lead (dict): Lead data
+        """
+        lead_id = lead.get("id")
 
-    def _process_follow_ups(self):
-        """Process follow-up emails for active campaigns"""
+        # Update lead status
+        self._record_lead_update(
+            lead_id,
+            "Initial Contact",
+            "Initial email sent"
+        )
+
+        # Add to active campaigns
         now = datetime.now()
-        leads_to_update = []
+        next_follow_up = now + FOLLOW_UP_INTERVAL
+        with self._state_lock:
+            self.active_campaigns[lead_id] = {
+                "lead": lead,
+                "sequence": "initial",
+                "last_contact": now,
+                "follow_up_count": 0,
+                "max_follow_ups": 3,
+                "next_follow_up": next_follow_up
+            }
+        self._schedule_follow_up(lead_id, next_follow_up)
 
-        for lead_id, campaign in list(self.active_campaigns.items()):
-            # Skip if not time for follow-up yet
-            if campaign["next_follow_up"] > now:
-                continue
+    def _schedule_follow_up(self, lead_id, when):
+        """
+        Schedule a campaign's next follow-up
 
-            # Skip if max follow-ups reached
-            if campaign["follow_up_count"] >= campaign["max_follow_ups"]:
-                # Close campaign
-                del self.active_campaigns[lead_id]
+        Args:
+            lead_id (str): Lead ID
+            when (datetime): When the follow-up is due
+        """
+        with self._follow_up_lock:
+            heapq.heappush(self._follow_up_heap, (when, lead_id))
 
-                # Update lead status
-                self.sheets_service.update_lead(
-                    lead_id,
-                    "No Response",
-                    f"Completed {campaign['follow_up_count']} follow-ups with no response"
-                )
-                continue
+    def _process_follow_ups(self):
+        """Process follow-up emails for active campaigns"""
+        now = datetime.now()
 
-            # Determine next follow-up template
-            campaign["follow_up_count"] += 1
-            sequence_type = f"follow_up_{campaign['follow_up_count']}"
+        # Pop only the campaigns that are due
+        due = []
+        pending_updates = []
+        with self._follow_up_lock:
+            while self._follow_up_heap and self._follow_up_heap[0][0] <= now:
+                due.append(heapq.heappop(self._follow_up_heap))
+
+        attempted = 0
+        failed = 0
+        for start in range(0, len(due), FOLLOW_UP_BATCH_SIZE):
+            # Stop when the SMTP server is rejecting mail; the rest wait for the next run
+            if attempted >= FOLLOW_UP_BATCH_SIZE and failed * 3 >= attempted:
+                self.logger.error("Aborting follow-ups after %s of %s sends failed, deferring %s campaigns",
+                                  failed, attempted, len(due) - start)
+                for next_follow_up, lead_id in due[start:]:
+                    self._schedule_follow_up(lead_id, next_follow_up)
+                break
+
+            sends = []
+            for next_follow_up, lead_id in due[start:start + FOLLOW_UP_BATCH_SIZE]:
+                with self._state_lock:
+                    # Skip entries for campaigns that were closed or rescheduled
+                    campaign = self.active_campaigns.get(lead_id)
+                    if campaign is None or campaign["next_follow_up"] != next_follow_up:
+                        continue
+
+                    # Skip if max follow-ups reached
+                    if campaign["follow_up_count"] >= campaign["max_follow_ups"]:
+                        # Close campaign
+                        self.active_campaigns.pop(lead_id, None)
+
+                        # Update lead status
+                        pending_updates.append((
+                            lead_id,
+                            "No Response",
+                            f"Completed {campaign['follow_up_count']} follow-ups with no response"
+                        ))
+                        continue
+
+                    # Determine next follow-up template
+                    campaign["follow_up_count"] += 1
+                    sequence_type = f"follow_up_{campaign['follow_up_count']}"
+
+                lead = campaign["lead"]
+                country = lead.get("country")
+                email = lead.get("email")
+
+                # Get template for the lead's country
+                template_data = self._get_email_template(sequence_type, self._normalize_lead(lead)[0])
+
+                # Personalize subject and body
+                subject, body = self._personalize_email(template_data, lead)
+
+                # Queue email so the mail workers send the batch concurrently
+                sends.append((next_follow_up, lead_id, campaign, email,
+                              self._queue_email(email, subject, body, country)))
+
+            for next_follow_up, lead_id, campaign, email, sent in sends:
+                attempted += 1
+
+                if sent.result():
+                    # Update campaign status
+                    with self._state_lock:
+                        campaign["last_contact"] = now
+                        campaign["next_follow_up"] = now + FOLLOW_UP_INTERVAL
+                    self._schedule_follow_up(lead_id, campaign["next_follow_up"])
+
+                    # Update lead status
+                    pending_updates.append((
+                        lead_id,
+                        "Follow-up",
+                        f"Follow-up email #{campaign['follow_up_count']} sent"
+                    ))
+
+                    self.logger.info("Sent follow-up #%s to %s", campaign['follow_up_count'], email)
+                else:
+                    # Log failure and retry on the next run
+                    failed += 1
+                    self.logger.error("Failed to send follow-up to %s", email)
+                    self._schedule_follow_up(lead_id, next_follow_up)
+
+        # One sheet request for the whole run
+        if pending_updates:
+            self.sheets_service.batch_update_leads(pending_updates)
+
+        if due:
+            self._save_campaign_state()
+
+    def _get_lead_by_email(self, email):
+        """
+        Find a lead by email address through a cached index
 
-            lead = campaign["lead"]
-            country = lead.get("country")
-            email = lead.get("email")
+        The index is rebuilt from the sheet when it is older than
+        LEAD_INDEX_TTL, or once on a miss in case the lead was just added.
 
-            # Determine country template set
-            country_code = "us" if country == "US" else "india"
+        Args:
+            email (str): Email address
 
-            # Get email template
-            templates = self._get_email_templates(sequence_type)
-            template_data = templates.get(country_code, templates["us"])
+        Returns:
+            dict: Lead data or None if not found
+        """
+        email = email.strip().lower()
 
-            # Personalize subject and body
-            subject = self._personalize_template(template_data["subject"], lead)
-            body = self._personalize_template(template_data["body"], lead)
+        with self._email_index_lock:
+            fresh = False
+            if time.monotonic() - self._email_index_ts > LEAD_INDEX_TTL:
+                self._rebuild_email_index()
+                fresh = True
 
-            # Send email
-            success = self._send_email(email, subject, body, country)
+            lead = self._email_to_lead.get(email)
+            if lead is None and not fresh:
+                self._rebuild_email_index()
+                lead = self._email_to_lead.get(email)
 
-            if success:
-                # Update campaign status
-                campaign["last_contact"] = now
-                campaign["next_follow_up"] = now + timedelta(days=3)
+        return lead
 
-                # Update lead status
-                self.sheets_service.update_lead(
-                    lead_id,
-                    "Follow-up",
-                    f"Follow-up email #{campaign['follow_up_count']} sent"
-                )
+    def _rebuild_email_index(self):
+        """Rebuild the email -> lead index from the sheet"""
+        index = {}
+        for lead in self.sheets_service.get_leads():
+            email = lead.get("email", "").strip().lower()
+            if email:
+                # Keep the first lead for an address, as the old scan did
+                index.setdefault(email, lead)
 
-                self.logger.info(f"Sent follow-up #{campaign['follow_up_count']} to {email}")
-            else:
-                # Log failure
-                self.logger.error(f"Failed to send follow-up to {email}")
+        self._email_to_lead = index
+        self._email_index_ts = time.monotonic()
 
     def handle_reply(self, email_data):
         """
@@ -474,36 +912,32 @@ class EmailService:
             body = email_data.get("body", "")
 
             # Find lead by email
-            leads = self.sheets_service.get_leads()
-            matching_leads = [lead for lead in leads if lead.get("email") == from_email]
+            lead = self._get_lead_by_email(from_email)
 
-            if not matching_leads:
-                self.logger.warning(f"Reply from unknown email: {from_email}")
+            if not lead:
+                self.logger.warning("Reply from unknown email: %s", from_email)
                 return False
 
-            lead = matching_leads[0]
             lead_id = lead.get("id")
 
             # Remove from active campaigns if exists
-            if lead_id in self.active_campaigns:
-                del self.active_campaigns[lead_id]
+            with self._state_lock:
+                closed = self.active_campaigns.pop(lead_id, None) is not None
+            if closed:
+                self._save_campaign_state()
 
             # Check for keywords indicating interest in a call
-            call_keywords = ["call", "meeting", "schedule", "calendly", "available", "time"]
-            wants_call = any(keyword in body.lower() for keyword in call_keywords)
+            wants_call = bool(_CALL_KEYWORD_RE.search(body))
 
             if wants_call:
                 # Send calendly link
                 country = lead.get("country")
-                country_code = "us" if country == "US" else "india"
 
-                # Get template
-                templates = self._get_email_templates("call_invite")
-                template_data = templates.get(country_code, templates["us"])
+                # Get template for the lead's country
+                template_data = self._get_email_template("call_invite", self._normalize_lead(lead)[0])
 
                 # Personalize
-                email_subject = self._personalize_template(template_data["subject"], lead)
-                email_body = self._personalize_template(template_data["body"], lead)
+                email_subject, email_body = self._personalize_email(template_data, lead)
 
                 # Send email
                 self._send_email(from_email, email_subject, email_body, country)
@@ -525,7 +959,7 @@ class EmailService:
             return True
 
         except Exception as e:
-            self.logger.error(f"Error handling email reply: {str(e)}")
+            self.logger.error("Error handling email reply: %s", e)
             return False
 
     def send_payment_link(self, lead, amount):
@@ -545,7 +979,7 @@ class EmailService:
             country = lead.get("country")
 
             if not email:
-                self.logger.warning(f"No email for lead {lead_id}, cannot send payment link")
+                self.logger.warning("No email for lead %s, cannot send payment link", lead_id)
                 return False
 
             # Format price based on country
@@ -557,16 +991,11 @@ class EmailService:
             # Add payment info to lead
             lead["price"] = formatted_price
 
-            # Get country template
-            country_code = "us" if country == "US" else "india"
-
-            # Get template
-            templates = self._get_email_templates("pricing_info")
-            template_data = templates.get(country_code, templates["us"])
+            # Get template for the lead's country
+            template_data = self._get_email_template("pricing_info", self._normalize_lead(lead)[0])
 
             # Personalize
-            email_subject = self._personalize_template(template_data["subject"], lead)
-            email_body = self._personalize_template(template_data["body"], lead)
+            email_subject, email_body = self._personalize_email(template_data, lead)
 
             # Send email
             success = self._send_email(email, email_subject, email_body, country)
@@ -580,13 +1009,15 @@ class EmailService:
                 )
 
                 # Remove from active campaigns if exists
-                if lead_id in self.active_campaigns:
-                    del self.active_campaigns[lead_id]
+                with self._state_lock:
+                    closed = self.active_campaigns.pop(lead_id, None) is not None
+                if closed:
+                    self._save_campaign_state()
 
                 return True
             else:
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error sending payment link: {str(e)}")
+            self.logger.error("Error sending payment link: %s", e)
             return False
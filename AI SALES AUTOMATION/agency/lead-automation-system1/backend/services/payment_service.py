@@ -13,14 +13,71 @@ from services.email_service import EmailService
 # Load environment variables
 load_dotenv()
 
+# Currency symbols and separators stripped from revenue strings in one pass
+_REV_STRIP = str.maketrans("", "", "$₹,")
+
+def _pricing_tiers(is_us, size_bucket, revenue_bucket):
+    """
+    Compute the suggested price of each tier for a pricing bucket
+
+    Args:
+        is_us (bool): US pricing in USD, otherwise India pricing in INR
+        size_bucket (int): 0 for under 10 employees, 1 for 10-100, 2 for over 100
+        revenue_bucket (int): 0 below the 5M threshold, 1 above 5M, 2 above 10M
+
+    Returns:
+        tuple: (tier, price, formatted price) for each tier
+    """
+    # Default pricing tiers
+    if is_us:
+        pricing = {
+            "standard": 2500,
+            "premium": 3500,
+            "enterprise": 5000
+        }
+    else:
+        pricing = {
+            "standard": 40000,
+            "premium": 85000,
+            "enterprise": 150000
+        }
+
+    # Adjust pricing based on company size
+    if size_bucket == 2:
+        # Larger company - increase prices
+        pricing = {k: v * 1.2 for k, v in pricing.items()}
+    elif size_bucket == 0:
+        # Small company - decrease prices slightly
+        pricing = {k: v * 0.9 for k, v in pricing.items()}
+
+    # Adjust pricing based on revenue
+    if revenue_bucket == 2:
+        pricing = {k: v * 1.3 for k, v in pricing.items()}
+    elif revenue_bucket == 1:
+        pricing = {k: v * 1.1 for k, v in pricing.items()}
+
+    # Format prices
+    if is_us:
+        return tuple((k, v, f"${v:,.2f}") for k, v in pricing.items())
+    return tuple((k, v, f"₹{int(v):,}") for k, v in pricing.items())
+
+# Every bucket's tiers, built once at import: (is_us, size_bucket, revenue_bucket) -> tiers
+PRICING_TABLE = {
+    (is_us, size_bucket, revenue_bucket): _pricing_tiers(is_us, size_bucket, revenue_bucket)
+    for is_us in (True, False)
+    for size_bucket in (0, 1, 2)
+    for revenue_bucket in (0, 1, 2)
+}
+
 class PaymentService:
     """
     Service for handling payments through Stripe (US) and Razorpay (India)
     """
 
-    def __init__(self):
+    def __init__(self, sheets_service=None, email_service=None):
         self.logger = logging.getLogger(__name__)
-        self.sheets_service = SheetsService()
+        self.sheets_service = sheets_service or SheetsService()
+        self.email_service = email_service or EmailService(self.sheets_service)
 
         # Initialize Stripe
         self.stripe_api_key = os.environ.get('STRIPE_API_KEY')
@@ -106,7 +163,7 @@ class PaymentService:
 
             # Log and store payment link
             payment_url = payment_link.url
-            self.logger.info(f"Created Stripe payment link for {lead.get('id')}: {payment_url}")
+            self.logger.info("Created Stripe payment link for %s: %s", lead.get('id'), payment_url)
 
             # Store payment link in lead data
             self.sheets_service.update_lead(
@@ -118,10 +175,10 @@ class PaymentService:
             return payment_url
 
         except stripe.error.StripeError as e:
-            self.logger.error(f"Stripe error: {str(e)}")
+            self.logger.error("Stripe error: %s", e)
             return f"#stripe-error: {str(e)}"
         except Exception as e:
-            self.logger.error(f"Error creating Stripe payment link: {str(e)}")
+            self.logger.error("Error creating Stripe payment link: %s", e)
             return "#payment-error"
 
     def _create_razorpay_payment_link(self, amount, lead):
@@ -182,7 +239,7 @@ class PaymentService:
 
             # Log and store payment link
             payment_url = payment_link['short_url']
-            self.logger.info(f"Created Razorpay payment link for {lead.get('id')}: {payment_url}")
+            self.logger.info("Created Razorpay payment link for %s: %s", lead.get('id'), payment_url)
 
             # Store payment link in lead data
             self.sheets_service.update_lead(
@@ -194,7 +251,7 @@ class PaymentService:
             return payment_url
 
         except Exception as e:
-            self.logger.error(f"Error creating Razorpay payment link: {str(e)}")
+            self.logger.error("Error creating Razorpay payment link: %s", e)
             return "#payment-error"
 
     def handle_webhook(self, webhook_data):
@@ -217,11 +274,11 @@ class PaymentService:
             elif source == "razorpay":
                 return self._handle_razorpay_webhook(webhook_data)
             else:
-                self.logger.warning(f"Unknown webhook source: {source}")
+                self.logger.warning("Unknown webhook source: %s", source)
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error handling payment webhook: {str(e)}")
+            self.logger.error("Error handling payment webhook: %s", e)
             return False
 
     def _handle_stripe_webhook(self, webhook_data):
@@ -268,7 +325,7 @@ class PaymentService:
             return False
 
         except Exception as e:
-            self.logger.error(f"Error handling Stripe webhook: {str(e)}")
+            self.logger.error("Error handling Stripe webhook: %s", e)
             return False
 
     def _handle_razorpay_webhook(self, webhook_data):
@@ -316,7 +373,7 @@ class PaymentService:
             return False
 
         except Exception as e:
-            self.logger.error(f"Error handling Razorpay webhook: {str(e)}")
+            self.logger.error("Error handling Razorpay webhook: %s", e)
             return False
 
     def _send_onboarding_email(self, lead):
@@ -330,14 +387,11 @@ class PaymentService:
             bool: Success status
         """
         try:
-            from email_service import EmailService
-            email_service = EmailService()
-
             country = lead.get("country", "US")
             email = lead.get("email", "")
 
             if not email:
-                self.logger.warning(f"No email for lead {lead.get('id')}, cannot send onboarding email")
+                self.logger.warning("No email for lead %s, cannot send onboarding email", lead.get('id'))
                 return False
 
             # Determine email template based on country
@@ -369,10 +423,10 @@ class PaymentService:
                 """
 
             # Personalize email
-            body = email_service._personalize_template(template, lead)
+            body = self.email_service._personalize_template(template, lead)
 
             # Send email
-            success = email_service._send_email(email, subject, body, country)
+            success = self.email_service._send_email(email, subject, body, country)
 
             if success:
                 self.sheets_service.update_lead(
@@ -385,7 +439,7 @@ class PaymentService:
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error sending onboarding email: {str(e)}")
+            self.logger.error("Error sending onboarding email: %s", e)
             return False
 
     def suggest_pricing(self, lead):
@@ -402,65 +456,32 @@ class PaymentService:
         revenue = lead.get("estimated_revenue", 0)
         company_size = lead.get("company_size", 0)
 
-        # Default pricing tiers
-        if country == "US":
-            pricing = {
-                "standard": 2500,
-                "premium": 3500,
-                "enterprise": 5000
-            }
-        else:
-            pricing = {
-                "standard": 40000,
-                "premium": 85000,
-                "enterprise": 150000
-            }
-
         # Adjust based on company size and revenue
         if isinstance(company_size, str):
             try:
                 company_size = int(company_size)
-            except:
+            except ValueError:
                 company_size = 0
 
         # Convert revenue to numeric if it's a string
         if isinstance(revenue, str):
             try:
                 # Remove currency symbols and commas
-                revenue = revenue.replace("$", "").replace("₹", "").replace(",", "")
-                revenue = float(revenue)
-            except:
+                revenue = float(revenue.translate(_REV_STRIP))
+            except ValueError:
                 revenue = 0
 
-        # Adjust pricing based on company size
-        if company_size > 100:
-            # Larger company - increase prices
-            pricing = {k: v * 1.2 for k, v in pricing.items()}
-        elif company_size < 10:
-            # Small company - decrease prices slightly
-            pricing = {k: v * 0.9 for k, v in pricing.items()}
+        # Bucket the lead and look its prices up in the table
+        size_bucket = 2 if company_size > 100 else 0 if company_size < 10 else 1
 
-        # Adjust pricing based on revenue
         if country == "US":
-            if revenue > 10000000:  # $10M+
-                pricing = {k: v * 1.3 for k, v in pricing.items()}
-            elif revenue > 5000000:  # $5M+
-                pricing = {k: v * 1.1 for k, v in pricing.items()}
+            revenue_bucket = 2 if revenue > 10000000 else 1 if revenue > 5000000 else 0  # $10M+ / $5M+
         else:
-            if revenue > 100000000:  # ₹10Cr+
-                pricing = {k: v * 1.3 for k, v in pricing.items()}
-            elif revenue > 50000000:  # ₹5Cr+
-                pricing = {k: v * 1.1 for k, v in pricing.items()}
+            revenue_bucket = 2 if revenue > 100000000 else 1 if revenue > 50000000 else 0  # ₹10Cr+ / ₹5Cr+
 
-        # Format prices
-        if country == "US":
-            formatted_pricing = {
-                k: f"${v:,.2f}" for k, v in pricing.items()
-            }
-        else:
-            formatted_pricing = {
-                k: f"₹{int(v):,}" for k, v in pricing.items()
-            }
+        tiers = PRICING_TABLE[(country == "US", size_bucket, revenue_bucket)]
+        pricing = {k: v for k, v, _ in tiers}
+        formatted_pricing = {k: formatted for k, _, formatted in tiers}
 
         return {
             "pricing": pricing,
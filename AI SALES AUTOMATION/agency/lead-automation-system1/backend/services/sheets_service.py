@@ -1,15 +1,97 @@
 import os
 import json
+import heapq
+import time
 import logging
-import pandas as pd
+import threading
+import orjson
+import httplib2
+from collections import Counter
+from itertools import chain
 from datetime import datetime
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from googleapiclient.model import JsonModel
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
 
 # Load environment variables
 load_dotenv()
 
+# Lead fields, in sheet column order (A:R)
+LEAD_HEADERS = (
+    "id", "first_name", "last_name", "email", "phone",
+    "linkedin_url", "title", "company", "company_website",
+    "industry", "company_size", "country",
+    "estimated_revenue", "status", "source",
+    "date_added", "last_contact", "notes"
+)
+STATUS_COLUMN = LEAD_HEADERS.index("status")
+
+# Column ranges read for analytics, with the lead fields they hold
+ANALYTICS_COLUMNS = (
+    ("A2:C", ("id", "first_name", "last_name")),
+    ("H2:H", ("company",)),
+    ("L2:L", ("country",)),
+    ("N2:N", ("status",)),
+    ("Q2:Q", ("last_contact",))
+)
+
+# Seconds before the lead ID -> row index is reloaded, in case rows were edited by hand
+ROW_INDEX_TTL = 300
+
+# Seconds analytics are served from memory before the sheets are read again
+ANALYTICS_TTL = 30
+
+class _OrjsonModel(JsonModel):
+    """Sheets API request/response model that encodes and decodes JSON with orjson"""
+
+    def serialize(self, body_value):
+        return orjson.dumps(body_value)
+
+    def deserialize(self, content):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+
+class _SessionHttp:
+    """
+    httplib2-compatible transport for the Sheets client on a pooled requests session
+
+    Connections are kept alive and shared between threads, unlike the
+    default httplib2 transport.
+    """
+
+    def __init__(self, credentials):
+        # Reads (GET) and cell writes (PUT) are idempotent, so they are retried
+        # with backoff on rate limits and server errors. POST batch updates
+        # may append rows and are not.
+        self.session = AuthorizedSession(credentials)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["GET", "PUT"]),
+                raise_on_status=False
+            )
+        ))
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        """Send a request, returning (httplib2.Response, content) like httplib2.Http"""
+        response = self.session.request(method, uri, data=body, headers=headers)
+        info = httplib2.Response(dict(response.headers, status=response.status_code))
+        info.reason = response.reason
+        return info, response.content
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
 class SheetsService:
     """
     Service for interacting with Google Sheets API for lead storage and management
@@ -21,11 +103,23 @@ class SheetsService:
         self.credentials_file = os.environ.get('GOOGLE_SHEETS_CREDENTIALS')
         self.service = None
 
+        # Sheet title -> numeric sheet ID, needed for appendCells requests
+        self._sheet_ids = {}
+
+        # Lead ID -> (sheet name, row number), loaded lazily from the ID columns
+        self._row_index = None
+        self._row_index_ts = 0
+        self._row_index_lock = threading.Lock()
+
+        # Last analytics result, dropped when leads are written
+        self._analytics = None
+        self._analytics_ts = 0
+
         # Initialize Google Sheets API
         try:
             self._init_service()
         except Exception as e:
-            self.logger.warning(f"Failed to initialize Google Sheets service: {str(e)}")
+            self.logger.warning("Failed to initialize Google Sheets service: %s", e)
 
     def _init_service(self):
         """Initialize Google Sheets API service"""
@@ -34,6 +128,9 @@ class SheetsService:
             return
 
         try:
+            # Imported here so processes without Sheets credentials skip it
+            from googleapiclient.discovery import build
+
             # Scopes needed for Google Sheets
             SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
@@ -42,7 +139,7 @@ class SheetsService:
                 self.credentials_file, scopes=SCOPES)
 
             # Build service
-            self.service = build('sheets', 'v4', credentials=credentials)
+            self.service = build('sheets', 'v4', http=_SessionHttp(credentials), model=_OrjsonModel())
             self.logger.info("Google Sheets API initialized successfully")
 
             # Ensure sheets exist
@@ -67,14 +164,17 @@ class SheetsService:
                 spreadsheetId=self.spreadsheet_id
             ).execute()
 
-            existing_sheets = [sheet['properties']['title'] for sheet in result.get('sheets', [])]
+            self._sheet_ids = {
+                sheet['properties']['title']: sheet['properties']['sheetId']
+                for sheet in result.get('sheets', [])
+            }
 
             # Add missing sheets
             for sheet_name in required_sheets:
-                if sheet_name not in existing_sheets:
-                    self.logger.info(f"Creating sheet: {sheet_name}")
+                if sheet_name not in self._sheet_ids:
+                    self.logger.info("Creating sheet: %s", sheet_name)
 
-                    self.service.spreadsheets().batchUpdate(
+                    response = self.service.spreadsheets().batchUpdate(
                         spreadsheetId=self.spreadsheet_id,
                         body={
                             "requests": [
@@ -88,6 +188,7 @@ class SheetsService:
                             ]
                         }
                     ).execute()
+                    self._sheet_ids[sheet_name] = response['replies'][0]['addSheet']['properties']['sheetId']
 
                     # Initialize headers
                     headers = [
@@ -111,6 +212,24 @@ class SheetsService:
         except Exception as e:
             self.logger.error(f"Error ensuring sheets exist: {str(e)}")
 
+    def _cell(self, value):
+        """
+        Convert a value to CellData, stored as-is like RAW input
+
+        Args:
+            value: Cell value
+
+        Returns:
+            dict: CellData with the user entered value
+        """
+        if value is None:
+            return {}
+        if isinstance(value, bool):
+            return {"userEnteredValue": {"boolValue": value}}
+        if isinstance(value, (int, float)):
+            return {"userEnteredValue": {"numberValue": value}}
+        return {"userEnteredValue": {"stringValue": str(value)}}
+
     def store_leads(self, leads):
         """
         Store leads in Google Sheets
@@ -132,6 +251,7 @@ class SheetsService:
         # Group leads by country
         us_leads = []
         india_leads = []
+        date_added = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         for lead in leads:
             # Prepare row data
@@ -151,7 +271,7 @@ class SheetsService:
                 lead.get("estimated_revenue", ""),
                 lead.get("status", "New"),
                 lead.get("source", "Apollo.io"),
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                date_added,
                 "",  # Last Contact
                 lead.get("notes", "")
             ]
@@ -163,32 +283,32 @@ class SheetsService:
                 india_leads.append(row_data)
 
         try:
-            # Store US leads
-            if us_leads:
-                self.service.spreadsheets().values().append(
-                    spreadsheetId=self.spreadsheet_id,
-                    range="US_Leads!A2",
-                    valueInputOption="RAW",
-                    insertDataOption="INSERT_ROWS",
-                    body={
-                        "values": us_leads
+            # Append rows to both sheets in one request
+            requests = [
+                {
+                    "appendCells": {
+                        "sheetId": self._sheet_ids[sheet_name],
+                        "rows": [{"values": [self._cell(value) for value in row]} for row in rows],
+                        "fields": "userEnteredValue"
                     }
-                ).execute()
-                self.logger.info(f"Stored {len(us_leads)} US leads in Google Sheets")
+                }
+                for sheet_name, rows in (("US_Leads", us_leads), ("India_Leads", india_leads))
+                if rows
+            ]
 
-            # Store India leads
-            if india_leads:
-                self.service.spreadsheets().values().append(
+            if requests:
+                self.service.spreadsheets().batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
-                    range="India_Leads!A2",
-                    valueInputOption="RAW",
-                    insertDataOption="INSERT_ROWS",
                     body={
-                        "values": india_leads
+                        "requests": requests
                     }
                 ).execute()
-                self.logger.info(f"Stored {len(india_leads)} India leads in Google Sheets")
 
+                # Appended rows are picked up by the next index load
+                self._invalidate_row_index()
+                self._analytics = None
+
+            self.logger.info("Stored %s US and %s India leads in Google Sheets", len(us_leads), len(india_leads))
             return True
 
         except Exception as e:
@@ -211,6 +331,9 @@ class SheetsService:
             self.logger.warning("Google Sheets service not initialized")
             return []
 
+        # pandas is slow to import, so only processes that read leads load it
+        import pandas as pd
+
         sheets_to_check = []
 
         if country == "US":
@@ -222,46 +345,41 @@ class SheetsService:
             sheets_to_check = ["US_Leads", "India_Leads"]
 
         all_leads = []
-        headers = [
-            "id", "first_name", "last_name", "email", "phone",
-            "linkedin_url", "title", "company", "company_website",
-            "industry", "company_size", "country",
-            "estimated_revenue", "status", "source",
-            "date_added", "last_contact", "notes"
-        ]
+        lead_ids = set(lead_ids) if lead_ids else None
 
         try:
-            for sheet_name in sheets_to_check:
-                # Get all data from sheet
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{sheet_name}!A1:R",
-                ).execute()
+            # Get all data from the sheets in one request
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{sheet_name}!A1:R" for sheet_name in sheets_to_check],
+            ).execute()
 
-                rows = result.get('values', [])
+            for sheet_name, value_range in zip(sheets_to_check, result.get('valueRanges', [])):
+                rows = value_range.get('values', [])
                 if not rows or len(rows) <= 1:
                     continue
 
-                # Skip header row and convert to list of dicts
-                for row in rows[1:]:
-                    # Pad row if needed
-                    padded_row = row + [""] * (len(headers) - len(row))
+                # Skip header row and apply filters on the raw cells, so
+                # filtered-out rows are never converted
+                rows = rows[1:]
 
-                    # Create lead dict
-                    lead = dict(zip(headers, padded_row))
+                if lead_ids:
+                    rows = [row for row in rows if row and row[0] in lead_ids]
 
-                    # Apply filters
-                    if lead_ids and lead["id"] not in lead_ids:
-                        continue
+                if status:
+                    rows = [row for row in rows if len(row) > STATUS_COLUMN and row[STATUS_COLUMN] == status]
 
-                    if status and lead["status"] != status:
-                        continue
+                if not rows:
+                    continue
+
+                # Short rows are padded with empty cells
+                df = pd.DataFrame(rows).reindex(columns=range(len(LEAD_HEADERS)), fill_value="").fillna("")
+                df.columns = LEAD_HEADERS
 
-                    # Infer country from sheet name if not set
-                    if not lead["country"]:
-                        lead["country"] = "US" if sheet_name == "US_Leads" else "IN"
+                # Infer country from sheet name if not set
+                df = df.assign(country=df["country"].replace("", "US" if sheet_name == "US_Leads" else "IN"))
 
-                    all_leads.append(lead)
+                all_leads.extend(df.to_dict("records"))
 
             return all_leads
 
@@ -279,8 +397,39 @@ class SheetsService:
         Returns:
             dict: Lead object
         """
-        leads = self.get_leads(lead_ids=[lead_id])
-        return leads[0] if leads else None
+        if not self.service or not lead_id:
+            return None
+
+        try:
+            # Fetch just the lead's row through the cached row index
+            row = self._get_rows({lead_id}).get(lead_id)
+            if row is None:
+                return None
+
+            sheet_name, i = row
+            result = self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{sheet_name}!A{i}:R{i}",
+            ).execute()
+
+            values = (result.get('values') or [[]])[0]
+            lead = dict(zip(LEAD_HEADERS, values + [""] * (len(LEAD_HEADERS) - len(values))))
+
+            # Rows moved since the index was loaded; fall back to a full read
+            if lead["id"] != lead_id:
+                self._invalidate_row_index()
+                leads = self.get_leads(lead_ids=[lead_id])
+                return leads[0] if leads else None
+
+            # Infer country from sheet name if not set
+            if not lead["country"]:
+                lead["country"] = "US" if sheet_name == "US_Leads" else "IN"
+
+            return lead
+
+        except Exception as e:
+            self.logger.error(f"Error getting lead from Google Sheets: {str(e)}")
+            return None
 
     def update_lead(self, lead_id, status, notes=""):
         """
@@ -288,89 +437,237 @@ class SheetsService:
 
         Args:
             lead_id (str): Lead ID to update
-            status (str): New status
+            status (str): New status, or None to keep the current one
             notes (str, optional): Notes to append
 
         Returns:
             bool: Success status
         """
-        if not self.service or not lead_id:
+        if not lead_id:
             return False
 
+        return self.batch_update_leads([(lead_id, status, notes)]) > 0
+
+    def _invalidate_row_index(self):
+        """Drop the row index so the next lookup reloads it"""
+        with self._row_index_lock:
+            self._row_index = None
+
+    def _load_row_index(self):
+        """
+        Load the lead ID -> (sheet name, row number) index from the ID columns
+
+        Returns:
+            dict: The loaded index
+        """
         sheets_to_check = ["US_Leads", "India_Leads"]
 
+        result = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{sheet_name}!A2:A" for sheet_name in sheets_to_check],
+        ).execute()
+
+        index = {}
+        for sheet_name, value_range in zip(sheets_to_check, result.get('valueRanges', [])):
+            for i, row in enumerate(value_range.get('values', []), start=2):  # start=2 to skip header and account for 1-indexing
+                if row and row[0] not in index:
+                    index[row[0]] = (sheet_name, i)
+
+        self._row_index = index
+        self._row_index_ts = time.monotonic()
+        return index
+
+    def _get_rows(self, lead_ids):
+        """
+        Look up the rows of leads through the cached row index
+
+        The index is reloaded when it is older than ROW_INDEX_TTL, or once
+        when a lead is missing in case it was added since the last load.
+
+        Args:
+            lead_ids (set): Lead IDs to look up
+
+        Returns:
+            dict: Lead ID -> (sheet name, row number) for the leads found
+        """
+        with self._row_index_lock:
+            index = self._row_index
+            if index is None or time.monotonic() - self._row_index_ts > ROW_INDEX_TTL:
+                index = self._load_row_index()
+            elif not lead_ids <= index.keys():
+                index = self._load_row_index()
+
+            return {lead_id: index[lead_id] for lead_id in lead_ids if lead_id in index}
+
+    def _read_rows(self, rows):
+        """
+        Read the ID (column A) and notes (column R) of several rows in one batchGet
+
+        Args:
+            rows (list): (sheet name, row number) tuples
+
+        Returns:
+            dict: (sheet name, row number) -> (lead ID, notes)
+        """
+        if not rows:
+            return {}
+
+        result = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{sheet_name}!{column}{i}" for sheet_name, i in rows for column in ("A", "R")],
+        ).execute()
+
+        cells = []
+        for value_range in result.get('valueRanges', []):
+            values = value_range.get('values', [])
+            cells.append(values[0][0] if values and values[0] else "")
+
+        return {row: (cells[2 * n], cells[2 * n + 1]) for n, row in enumerate(rows)}
+
+    def batch_update_leads(self, updates):
+        """
+        Update the status and notes of several leads in one request
+
+        Rows are found through the cached row index. The ID and notes cells
+        of those rows are read to confirm each row still holds its lead (the
+        index is reloaded once if one has moved), then every status, notes
+        and last contact cell is written with a single batchUpdate.
+
+        Args:
+            updates (list): (lead_id, status, notes) tuples, applied in order;
+                a status of None keeps the lead's current status
+
+        Returns:
+            int: Number of updates applied
+        """
+        if not self.service or not updates:
+            return 0
+
         try:
-            for sheet_name in sheets_to_check:
-                # Get all data from sheet
-                result = self.service.spreadsheets().values().get(
+            lead_ids = {lead_id for lead_id, _, _ in updates}
+            rows_by_id = self._get_rows(lead_ids)
+            cells_by_row = self._read_rows(list(set(rows_by_id.values())))
+
+            # Rows edited since the index was loaded; reload it and check again
+            moved = {lead_id for lead_id, row in rows_by_id.items() if cells_by_row[row][0] != lead_id}
+            if moved:
+                self._invalidate_row_index()
+                rows_by_id = self._get_rows(lead_ids)
+                cells_by_row = self._read_rows(list(set(rows_by_id.values())))
+                rows_by_id = {
+                    lead_id: row for lead_id, row in rows_by_id.items()
+                    if cells_by_row[row][0] == lead_id
+                }
+
+            # Current notes (column R) of the rows being updated
+            current_notes = {row: cells_by_row[row][1] for row in rows_by_id.values()}
+
+            now = datetime.now()
+            timestamp = now.strftime("%Y-%m-%d %H:%M")
+            last_contact = now.strftime("%Y-%m-%d %H:%M:%S")
+
+            # Later updates to the same lead overwrite its status and extend its notes
+            cells = {}
+            applied = 0
+            for lead_id, status, notes in updates:
+                if lead_id not in rows_by_id:
+                    self.logger.warning("Lead %s not found in sheets", lead_id)
+                    continue
+
+                sheet_name, i = row = rows_by_id[lead_id]
+
+                # Status (column N), last contact date (column Q)
+                if status is not None:
+                    cells[f"{sheet_name}!N{i}"] = status
+                cells[f"{sheet_name}!Q{i}"] = last_contact
+
+                # Append new notes (column R)
+                if notes:
+                    previous = current_notes.get(row, "")
+                    current_notes[row] = f"{previous}\n{timestamp} - {notes}" if previous else f"{timestamp} - {notes}"
+                    cells[f"{sheet_name}!R{i}"] = current_notes[row]
+
+                applied += 1
+
+            if cells:
+                self.service.spreadsheets().values().batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
-                    range=f"{sheet_name}!A1:R",
+                    body={
+                        "valueInputOption": "RAW",
+                        "data": [{"range": cell, "values": [[value]]} for cell, value in cells.items()]
+                    }
                 ).execute()
+                self._analytics = None
 
-                rows = result.get('values', [])
-                if not rows or len(rows) <= 1:
-                    continue
-
-                # Find lead
-                for i, row in enumerate(rows[1:], start=2):  # start=2 to skip header and account for 1-indexing
-                    if row[0] == lead_id:  # ID is in column A (index 0)
-                        # Update status (column N, index 13)
-                        self.service.spreadsheets().values().update(
-                            spreadsheetId=self.spreadsheet_id,
-                            range=f"{sheet_name}!N{i}",
-                            valueInputOption="RAW",
-                            body={
-                                "values": [[status]]
-                            }
-                        ).execute()
-
-                        # Get current notes
-                        current_notes = row[17] if len(row) > 17 else ""
-
-                        # Append new notes
-                        if notes:
-                            updated_notes = f"{current_notes}\n{datetime.now().strftime('%Y-%m-%d %H:%M')} - {notes}" if current_notes else f"{datetime.now().strftime('%Y-%m-%d %H:%M')} - {notes}"
-
-                            # Update notes (column R, index 17)
-                            self.service.spreadsheets().values().update(
-                                spreadsheetId=self.spreadsheet_id,
-                                range=f"{sheet_name}!R{i}",
-                                valueInputOption="RAW",
-                                body={
-                                    "values": [[updated_notes]]
-                                }
-                            ).execute()
-
-                        # Update last contact date (column Q, index 16)
-                        self.service.spreadsheets().values().update(
-                            spreadsheetId=self.spreadsheet_id,
-                            range=f"{sheet_name}!Q{i}",
-                            valueInputOption="RAW",
-                            body={
-                                "values": [[datetime.now().strftime("%Y-%m-%d %H:%M:%S")]]
-                            }
-                        ).execute()
-
-                        self.logger.info(f"Updated lead {lead_id} status to {status}")
-                        return True
-
-            self.logger.warning(f"Lead {lead_id} not found in sheets")
-            return False
+            self.logger.info("Updated %s of %s leads in Google Sheets", applied, len(updates))
+            return applied
 
         except Exception as e:
-            self.logger.error(f"Error updating lead in Google Sheets: {str(e)}")
-            return False
+            self.logger.error(f"Error updating leads in Google Sheets: {str(e)}")
+            return 0
+
+    def _get_analytics_leads(self):
+        """
+        Read only the columns analytics needs from both lead sheets
+
+        The columns come back as formatted strings in one batchGet, column by
+        column, and are zipped into slim lead dicts. Strings keep every cell
+        comparable, so last_contact can be ranked even where the sheet holds
+        numbers or dates.
+
+        Returns:
+            tuple: (US leads, India leads)
+        """
+        sheets = (("US_Leads", "US"), ("India_Leads", "IN"))
+
+        result = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{sheet_name}!{cells}" for sheet_name, _ in sheets for cells, _ in ANALYTICS_COLUMNS],
+            majorDimension="COLUMNS",
+            valueRenderOption="FORMATTED_VALUE",
+        ).execute()
+        value_ranges = iter(result.get('valueRanges', []))
+
+        leads_by_sheet = []
+        for sheet_name, default_country in sheets:
+            columns = {}
+            for _, fields in ANALYTICS_COLUMNS:
+                values = next(value_ranges, {}).get('values', [])
+                for i, field in enumerate(fields):
+                    columns[field] = values[i] if i < len(values) else []
+
+            # Columns stop at their last non-empty cell, so pad the shorter ones
+            row_count = max(len(column) for column in columns.values())
+            leads = [
+                {field: column[row] if row < len(column) else "" for field, column in columns.items()}
+                for row in range(row_count)
+            ]
+
+            # Infer country from sheet name if not set
+            for lead in leads:
+                lead["country"] = lead["country"] or default_country
+
+            leads_by_sheet.append(leads)
+
+        return tuple(leads_by_sheet)
 
     def get_analytics_data(self):
         """
         Get analytics data from Google Sheets
 
+        Results are reused for ANALYTICS_TTL seconds, or until leads are
+        stored or updated through this service.
+
         Returns:
             dict: Analytics data
         """
         if not self.service:
             return {}
 
+        analytics = self._analytics
+        if analytics is not None and time.monotonic() - self._analytics_ts < ANALYTICS_TTL:
+            return analytics
+
         analytics = {
             "us_leads": {
                 "total": 0,
@@ -385,27 +682,16 @@ class SheetsService:
         }
 
         try:
-            # Get US leads statistics
-            us_leads = self.get_leads(country="US")
+            us_leads, india_leads = self._get_analytics_leads()
             analytics["us_leads"]["total"] = len(us_leads)
-
-            # Group by status
-            for lead in us_leads:
-                status = lead.get("status", "New")
-                if status not in analytics["us_leads"]["by_status"]:
-                    analytics["us_leads"]["by_status"][status] = 0
-                analytics["us_leads"]["by_status"][status] += 1
-
-            # Get India leads statistics
-            india_leads = self.get_leads(country="IN")
             analytics["india_leads"]["total"] = len(india_leads)
 
-            # Group by status
-            for lead in india_leads:
-                status = lead.get("status", "New")
-                if status not in analytics["india_leads"]["by_status"]:
-                    analytics["india_leads"]["by_status"][status] = 0
-                analytics["india_leads"]["by_status"][status] += 1
+            # Count (bucket, status) pairs in one pass, then project per bucket
+            counts = Counter(("us_leads", lead["status"] or "New") for lead in us_leads)
+            counts.update(("india_leads", lead["status"] or "New") for lead in india_leads)
+
+            for (bucket, status), count in counts.items():
+                analytics[bucket]["by_status"][status] = count
 
             # Calculate overall conversion rate (if any payment made)
             total_leads = analytics["us_leads"]["total"] + analytics["india_leads"]["total"]
@@ -417,14 +703,13 @@ class SheetsService:
                 analytics["overall_conversion_rate"] = (total_paid / total_leads) * 100
 
             # Get recent activities (last 10 leads with updated status)
-            all_leads = us_leads + india_leads
-            sorted_leads = sorted(
-                all_leads,
-                key=lambda x: x.get("last_contact", ""),
-                reverse=True
+            recent_leads = heapq.nlargest(
+                10,
+                chain(us_leads, india_leads),
+                key=lambda x: x.get("last_contact", "")
             )
 
-            for lead in sorted_leads[:10]:
+            for lead in recent_leads:
                 analytics["recent_activities"].append({
                     "id": lead.get("id", ""),
                     "name": f"{lead.get('first_name', '')} {lead.get('last_name', '')}",
@@ -434,6 +719,8 @@ class SheetsService:
                     "country": lead.get("country", "")
                 })
 
+            self._analytics = analytics
+            self._analytics_ts = time.monotonic()
             return analytics
 
         except Exception as e:
@@ -1,6 +1,10 @@
 import os
+import atexit
 import logging
 import json
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -10,14 +14,144 @@ from services.sheets_service import SheetsService
 # Load environment variables
 load_dotenv()
 
+# Seconds tracked events are buffered before they are written in one batch
+TRACKING_FLUSH_SECONDS = 5
+
+# Leads looked up by tracked events are reused for this many seconds
+LEAD_CACHE_TTL = 60
+LEAD_CACHE_SIZE = 4096
+
+# Repeats of the same open or click within this many seconds are not written
+EVENT_DEDUP_WINDOW = 90
+EVENT_DEDUP_SIZE = 65536
+
+# Lead statuses counted towards each funnel rate
+REPLY_STATUSES = ("Replied", "Call Requested")
+CALL_STATUSES = ("Call Requested", "Call Scheduled")
+PAYMENT_STATUSES = ("Payment Link Sent", "Payment Received")
+CONVERSION_STATUSES = ("Payment Received", "Onboarding")
+
+FUNNEL_RATES = (
+    ("reply_rate", REPLY_STATUSES),
+    ("call_rate", CALL_STATUSES),
+    ("payment_rate", PAYMENT_STATUSES),
+    ("conversion_rate", CONVERSION_STATUSES)
+)
+
+def _count_statuses(status_counts, statuses):
+    """Sum the lead counts of a group of statuses"""
+    return sum(status_counts.get(status, 0) for status in statuses)
+
 class TrackingService:
     """
     Service for tracking and optimizing the sales funnel
     """
 
-    def __init__(self):
+    def __init__(self, sheets_service=None):
         self.logger = logging.getLogger(__name__)
-        self.sheets_service = SheetsService()
+        self.sheets_service = sheets_service or SheetsService()
+
+        # Lead updates from tracked events, written by a timer in one batch
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.flush)
+
+        # Lead ID -> (lead, fetched at), least recently used first
+        self._lead_cache = OrderedDict()
+        self._lead_cache_lock = threading.Lock()
+
+        # Event key -> first seen at, oldest first
+        self._seen_events = OrderedDict()
+        self._seen_events_lock = threading.Lock()
+
+    def _is_duplicate_event(self, key):
+        """
+        Check whether an event was already tracked within the dedup window,
+        remembering it if not
+
+        Args:
+            key (tuple): Event key
+
+        Returns:
+            bool: True if the event is a repeat
+        """
+        now = time.monotonic()
+        with self._seen_events_lock:
+            # Entries are in first-seen order, so expired ones are at the front
+            while self._seen_events:
+                oldest_key, seen_at = next(iter(self._seen_events.items()))
+                if now - seen_at < EVENT_DEDUP_WINDOW and len(self._seen_events) < EVENT_DEDUP_SIZE:
+                    break
+                del self._seen_events[oldest_key]
+
+            if key in self._seen_events:
+                return True
+
+            self._seen_events[key] = now
+            return False
+
+    def _get_lead(self, lead_id):
+        """
+        Get a lead through a small TTL cache, so bursts of events for the
+        same lead (open, then clicks) read the sheet once. Cached leads are
+        only used to check the lead exists, never to write a status back
+
+        Args:
+            lead_id (str): Lead ID
+
+        Returns:
+            dict: Lead object or None if not found
+        """
+        now = time.monotonic()
+        with self._lead_cache_lock:
+            entry = self._lead_cache.get(lead_id)
+            if entry is not None and now - entry[1] < LEAD_CACHE_TTL:
+                self._lead_cache.move_to_end(lead_id)
+                return entry[0]
+
+        lead = self.sheets_service.get_lead(lead_id)
+
+        # Unknown leads are not cached, in case they are added shortly
+        if lead:
+            with self._lead_cache_lock:
+                self._lead_cache[lead_id] = (lead, now)
+                self._lead_cache.move_to_end(lead_id)
+                if len(self._lead_cache) > LEAD_CACHE_SIZE:
+                    self._lead_cache.popitem(last=False)
+
+        return lead
+
+    def _record_update(self, lead_id, status, notes):
+        """
+        Buffer a lead update and arm the flush timer if it is not running
+
+        Args:
+            lead_id (str): Lead ID to update
+            status (str): New status, or None to keep the current one
+            notes (str): Notes to append, stamped with the time at flush
+        """
+        with self._pending_lock:
+            self._pending.append((lead_id, status, notes))
+
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(TRACKING_FLUSH_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Write all buffered tracking updates with a single batch update"""
+        with self._pending_lock:
+            updates, self._pending = self._pending, []
+            self._flush_timer = None
+
+        if updates:
+            # Events are at most a flush interval old, so one stamp covers the batch
+            stamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+            self.sheets_service.batch_update_leads([
+                (lead_id, status, f"{notes} at {stamp}")
+                for lead_id, status, notes in updates
+            ])
 
     def get_analytics(self):
         """
@@ -88,61 +222,25 @@ class TrackingService:
             us_status = us_leads.get("by_status", {})
             india_status = india_leads.get("by_status", {})
 
-            # US metrics
-            if us_total > 0:
-                metrics["by_country"]["US"]["reply_rate"] = self._calculate_percentage(
-                    us_status.get("Replied", 0) + us_status.get("Call Requested", 0),
-                    us_total
-                )
-
-                metrics["by_country"]["US"]["call_rate"] = self._calculate_percentage(
-                    us_status.get("Call Requested", 0) + us_status.get("Call Scheduled", 0),
-                    us_total
-                )
-
-                metrics["by_country"]["US"]["payment_rate"] = self._calculate_percentage(
-                    us_status.get("Payment Link Sent", 0) + us_status.get("Payment Received", 0),
-                    us_total
-                )
-
-                metrics["by_country"]["US"]["conversion_rate"] = self._calculate_percentage(
-                    us_status.get("Payment Received", 0) + us_status.get("Onboarding", 0),
-                    us_total
-                )
-
-            # India metrics
-            if india_total > 0:
-                metrics["by_country"]["India"]["reply_rate"] = self._calculate_percentage(
-                    india_status.get("Replied", 0) + india_status.get("Call Requested", 0),
-                    india_total
-                )
-
-                metrics["by_country"]["India"]["call_rate"] = self._calculate_percentage(
-                    india_status.get("Call Requested", 0) + india_status.get("Call Scheduled", 0),
-                    india_total
-                )
-
-                metrics["by_country"]["India"]["payment_rate"] = self._calculate_percentage(
-                    india_status.get("Payment Link Sent", 0) + india_status.get("Payment Received", 0),
-                    india_total
-                )
-
-                metrics["by_country"]["India"]["conversion_rate"] = self._calculate_percentage(
-                    india_status.get("Payment Received", 0) + india_status.get("Onboarding", 0),
-                    india_total
-                )
+            # Per-country metrics
+            for country, country_total, status_counts in (("US", us_total, us_status),
+                                                          ("India", india_total, india_status)):
+                if country_total > 0:
+                    for rate, statuses in FUNNEL_RATES:
+                        metrics["by_country"][country][rate] = self._calculate_percentage(
+                            _count_statuses(status_counts, statuses),
+                            country_total
+                        )
 
             # Overall metrics
-            overall_replied = (us_status.get("Replied", 0) + us_status.get("Call Requested", 0) +
-                              india_status.get("Replied", 0) + india_status.get("Call Requested", 0))
+            overall_replied = _count_statuses(us_status, REPLY_STATUSES) + _count_statuses(india_status, REPLY_STATUSES)
 
-            overall_calls = (us_status.get("Call Requested", 0) + us_status.get("Call Scheduled", 0) +
-                            india_status.get("Call Requested", 0) + india_status.get("Call Scheduled", 0))
+            overall_calls = _count_statuses(us_status, CALL_STATUSES) + _count_statuses(india_status, CALL_STATUSES)
 
-            overall_payments_sent = (us_status.get("Payment Link Sent", 0) + india_status.get("Payment Link Sent", 0))
+            overall_payments_sent = us_status.get("Payment Link Sent", 0) + india_status.get("Payment Link Sent", 0)
 
-            overall_payments_received = (us_status.get("Payment Received", 0) + us_status.get("Onboarding", 0) +
-                                       india_status.get("Payment Received", 0) + india_status.get("Onboarding", 0))
+            overall_payments_received = (_count_statuses(us_status, CONVERSION_STATUSES) +
+                                         _count_statuses(india_status, CONVERSION_STATUSES))
 
             # Calculate overall rates
             metrics["overall"]["reply_rate"] = self._calculate_percentage(overall_replied, total_leads)
@@ -287,18 +385,23 @@ class TrackingService:
             bool: Success status
         """
         try:
+            # Prefetched pixels and repeat opens are only written once
+            if self._is_duplicate_event(("open", email_id, lead_id)):
+                return True
+
             # Get lead
-            lead = self.sheets_service.get_lead(lead_id)
+            lead = self._get_lead(lead_id)
 
             if not lead:
-                self.logger.warning(f"Cannot track email open for unknown lead: {lead_id}")
+                self.logger.warning("Cannot track email open for unknown lead: %s", lead_id)
                 return False
 
-            # Update lead notes
-            self.sheets_service.update_lead(
+            # Append notes only; a None status keeps any newer status set by
+            # other services. Written with the next batch
+            self._record_update(
                 lead_id,
-                lead.get("status", "Contacted"),
-                f"Email opened: {email_id} at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                None,
+                f"Email opened: {email_id}"
             )
 
             return True
@@ -320,31 +423,35 @@ class TrackingService:
             bool: Success status
         """
         try:
+            # Double clicks are only written once
+            if self._is_duplicate_event(("click", link_id, lead_id, link_type)):
+                return True
+
             # Get lead
-            lead = self.sheets_service.get_lead(lead_id)
+            lead = self._get_lead(lead_id)
 
             if not lead:
-                self.logger.warning(f"Cannot track link click for unknown lead: {lead_id}")
+                self.logger.warning("Cannot track link click for unknown lead: %s", lead_id)
                 return False
 
-            # Update lead notes based on link type
+            # Update lead notes based on link type; written with the next batch
             if link_type == "calendly":
-                self.sheets_service.update_lead(
+                self._record_update(
                     lead_id,
                     "Call Link Clicked",
-                    f"Calendly link clicked at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                    "Calendly link clicked"
                 )
             elif link_type == "payment":
-                self.sheets_service.update_lead(
+                self._record_update(
                     lead_id,
                     "Payment Link Clicked",
-                    f"Payment link clicked at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                    "Payment link clicked"
                 )
             else:
-                self.sheets_service.update_lead(
+                self._record_update(
                     lead_id,
-                    lead.get("status", "Contacted"),
-                    f"Link clicked: {link_id} ({link_type}) at {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                    None,
+                    f"Link clicked: {link_id} ({link_type})"
                 )
 
             return True
@@ -79,6 +79,10 @@ document.addEventListener('DOMContentLoaded', function() {
             return this.fetchAPI('/outreach/start', 'POST', { lead_ids: leadIds });
         },
 
+        async getOutreachStatus(jobId) {
+            return this.fetchAPI(`/outreach/status/${jobId}`);
+        },
+
         async updateLead(leadId, status, notes) {
             return this.fetchAPI('/lead/update', 'POST', {
                 lead_id: leadId,
@@ -384,8 +388,13 @@ document.addEventListener('DOMContentLoaded', function() {
             button.disabled = true;
             button.innerHTML = `<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Processing...`;
 
-            // Call API
+            // Call API, then poll the background job until it finishes
             window.api.startOutreach(selectedLeads).then(result => {
+                if (!result.success) {
+                    throw new Error(result.error || 'Unknown error');
+                }
+                return waitForOutreach(result.data.job_id);
+            }).then(result => {
                 if (result.success) {
                     showNotification('success', `Outreach started for ${result.data.success} leads`);
 
@@ -413,5 +422,15 @@ document.addEventListener('DOMContentLoaded', function() {
                 showNotification('error', error.message);
             });
         }
+
+        function waitForOutreach(jobId) {
+            return window.api.getOutreachStatus(jobId).then(result => {
+                if (result.success && !result.data.ready) {
+                    return new Promise(resolve => setTimeout(resolve, 1000))
+                        .then(() => waitForOutreach(jobId));
+                }
+                return result;
+            });
+        }
     }
 });
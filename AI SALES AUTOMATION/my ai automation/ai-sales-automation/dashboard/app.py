@@ -5,11 +5,19 @@ A simple web interface to monitor the AI sales automation system.
 """
 
 import os
+import re
 import sys
-import json
+import time
+import heapq
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+import orjson
 from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask.json.provider import JSONProvider
 import pandas as pd
 import plotly
 import plotly.express as px
@@ -23,7 +31,19 @@ from modules.google_sheets import GoogleSheetsManager
 from modules.lead_generation import LeadManager
 from config import GoogleSheetsConfig
 
+# JSON provider backed by orjson
+class OrjsonProvider(JSONProvider):
+    """Serialize dashboard JSON responses with orjson."""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure logging
 logging.basicConfig(
@@ -48,6 +68,106 @@ except Exception as e:
     # Create a dummy manager for demo purposes
     sheets_manager = None
 
+# Location buckets for lead stats; the India branch is tried first so it takes precedence
+LOCATION_PATTERN = re.compile(r"^(?:.*(?P<india>India)|.*(?P<us>United States|USA))")
+
+def record_column(df, column, default):
+    """Get a column of a records frame, filling records that lack it with the default."""
+    if column in df:
+        return df[column].fillna(default)
+    return pd.Series(default, index=df.index, dtype=object)
+
+def count_values(df, column, default=""):
+    """Count records by the value of a column, in order of first appearance."""
+    return record_column(df, column, default).value_counts(sort=False).to_dict()
+
+def completed_revenue(df):
+    """Sum the prices of completed deals in USD and INR."""
+    completed = record_column(df, "status", "").eq("Completed")
+    currency = record_column(df, "currency", "")
+    price = record_column(df, "price", 0)
+    return price[completed & currency.eq("USD")].sum(), price[completed & currency.eq("INR")].sum()
+
+# Seconds worksheet records are reused across dashboard polls
+SHEET_CACHE_TTL = 15
+
+# Sheet name -> (records, fetched at)
+_sheet_cache = {}
+
+# Sheet name -> lock held while that worksheet is read, so a burst of polls
+# shares one Sheets call while different worksheets are read in parallel
+_sheet_locks = {}
+
+# Threads for reading worksheets concurrently
+sheets_executor = ThreadPoolExecutor(max_workers=8)
+
+def _sheet_lock(sheet_name):
+    """Get the read lock of a worksheet."""
+    return _sheet_locks.setdefault(sheet_name, threading.Lock())
+
+def get_sheet_records(sheet_name):
+    """
+    Get all records of a worksheet, reusing a read from the last few seconds.
+
+    Args:
+        sheet_name: Name of the worksheet
+
+    Returns:
+        List of record dictionaries, or None if the worksheet doesn't exist
+    """
+    with _sheet_lock(sheet_name):
+        now = time.monotonic()
+        entry = _sheet_cache.get(sheet_name)
+        if entry and now - entry[1] < SHEET_CACHE_TTL:
+            return entry[0]
+
+        worksheet = sheets_manager._get_worksheet(sheet_name, create_if_missing=False)
+        records = worksheet.get_all_records() if worksheet else None
+
+        _sheet_cache[sheet_name] = (records, now)
+        return records
+
+def get_sheets_records(sheet_names):
+    """
+    Get all records of several worksheets, reading the stale ones in one batch call.
+
+    Args:
+        sheet_names: Names of the worksheets
+
+    Returns:
+        Dictionary of worksheet name to records (None if the worksheet doesn't exist)
+    """
+    result = {}
+
+    # Locks are taken in name order so concurrent callers can't deadlock
+    locks = [_sheet_lock(name) for name in sorted(set(sheet_names))]
+    for lock in locks:
+        lock.acquire()
+    try:
+        now = time.monotonic()
+        stale = []
+        for name in sheet_names:
+            entry = _sheet_cache.get(name)
+            if entry and now - entry[1] < SHEET_CACHE_TTL:
+                result[name] = entry[0]
+            else:
+                stale.append(name)
+
+        if stale:
+            for name, records in sheets_manager.batch_get_records(stale).items():
+                _sheet_cache[name] = (records, now)
+                result[name] = records
+    finally:
+        for lock in locks:
+            lock.release()
+
+    # A missing worksheet fails the whole batch; read those separately, in parallel
+    missing = [name for name in sheet_names if name not in result]
+    for name, records in zip(missing, sheets_executor.map(get_sheet_records, missing)):
+        result[name] = records
+
+    return result
+
 # Sample data for demo purposes
 def get_demo_data():
     return {
@@ -87,6 +207,46 @@ def get_demo_data():
         ]
     }
 
+# Directory of generated content schedules
+SCHEDULE_DIR = "../data/schedules"
+
+# Newest schedule file, reused until the schedule directory changes
+_schedule_cache = {"mtime": None, "path": None}
+_schedule_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _load_schedule(path, mtime):
+    """Parse a schedule file; the mtime is part of the key so rewrites are re-read."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+def get_latest_schedule():
+    """
+    Get the newest content schedule, scanning only when the directory changes
+    and parsing only when the file changes.
+
+    Returns:
+        Schedule dictionary, or None if there are no schedule files
+    """
+    mtime = os.stat(SCHEDULE_DIR).st_mtime_ns
+    with _schedule_cache_lock:
+        if _schedule_cache["mtime"] != mtime:
+            # Filenames include the date, so the newest sorts last
+            with os.scandir(SCHEDULE_DIR) as entries:
+                schedule_file = max(
+                    (entry.path for entry in entries
+                     if entry.name.startswith("content_schedule_") and entry.name.endswith(".json")),
+                    default=None
+                )
+            _schedule_cache.update(mtime=mtime, path=schedule_file)
+
+        schedule_file = _schedule_cache["path"]
+
+    if not schedule_file:
+        return None
+
+    return _load_schedule(schedule_file, os.stat(schedule_file).st_mtime_ns)
+
 @app.route('/')
 def index():
     """Dashboard home page."""
@@ -97,7 +257,7 @@ def get_leads():
     """Get lead data."""
     try:
         if sheets_manager:
-            leads = sheets_manager.get_leads()
+            leads = get_sheet_records(GoogleSheetsConfig.LEADS_SHEET) or []
         else:
             leads = get_demo_data()["leads"]
 
@@ -117,32 +277,20 @@ def get_lead_stats():
     """Get lead statistics."""
     try:
         if sheets_manager:
-            leads = sheets_manager.get_leads()
+            leads = get_sheet_records(GoogleSheetsConfig.LEADS_SHEET) or []
         else:
             leads = get_demo_data()["leads"]
 
+        df = pd.DataFrame(leads)
+
         # Count leads by status
-        status_counts = {}
-        for lead in leads:
-            status = lead.get("status", "New")
-            if status in status_counts:
-                status_counts[status] += 1
-            else:
-                status_counts[status] = 1
-
-        # Count leads by location
-        location_counts = {}
-        for lead in leads:
-            location = lead.get("location", "Unknown")
-            if "India" in location:
-                location = "India"
-            elif "United States" in location or "USA" in location:
-                location = "United States"
-
-            if location in location_counts:
-                location_counts[location] += 1
-            else:
-                location_counts[location] = 1
+        status_counts = count_values(df, "status", "New")
+
+        # Count leads by location, India taking precedence
+        locations = record_column(df, "location", "Unknown").astype(str)
+        matches = locations.str.extract(LOCATION_PATTERN)
+        locations = locations.mask(matches["us"].notna(), "United States").mask(matches["india"].notna(), "India")
+        location_counts = locations.value_counts(sort=False).to_dict()
 
         return jsonify({
             "success": True,
@@ -164,11 +312,7 @@ def get_outreach():
     """Get outreach data."""
     try:
         if sheets_manager:
-            outreach_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.OUTREACH_SHEET, create_if_missing=False)
-            if outreach_worksheet:
-                outreach = outreach_worksheet.get_all_records()
-            else:
-                outreach = []
+            outreach = get_sheet_records(GoogleSheetsConfig.OUTREACH_SHEET) or []
         else:
             outreach = get_demo_data()["outreach"]
 
@@ -188,34 +332,20 @@ def get_outreach_stats():
     """Get outreach statistics."""
     try:
         if sheets_manager:
-            outreach_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.OUTREACH_SHEET, create_if_missing=False)
-            if outreach_worksheet:
-                outreach = outreach_worksheet.get_all_records()
-            else:
-                outreach = []
+            outreach = get_sheet_records(GoogleSheetsConfig.OUTREACH_SHEET) or []
         else:
             outreach = get_demo_data()["outreach"]
 
+        df = pd.DataFrame(outreach)
+
         # Count actions
-        action_counts = {}
-        for record in outreach:
-            action = record.get("action", "")
-            if action in action_counts:
-                action_counts[action] += 1
-            else:
-                action_counts[action] = 1
+        action_counts = count_values(df, "action")
 
         # Count platforms
-        platform_counts = {}
-        for record in outreach:
-            platform = record.get("platform", "")
-            if platform in platform_counts:
-                platform_counts[platform] += 1
-            else:
-                platform_counts[platform] = 1
+        platform_counts = count_values(df, "platform")
 
         # Count response rate
-        response_count = sum(1 for record in outreach if record.get("response", ""))
+        response_count = int(record_column(df, "response", "").astype(bool).sum())
 
         return jsonify({
             "success": True,
@@ -239,11 +369,7 @@ def get_deals():
     """Get deal data."""
     try:
         if sheets_manager:
-            deals_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.DEALS_SHEET, create_if_missing=False)
-            if deals_worksheet:
-                deals = deals_worksheet.get_all_records()
-            else:
-                deals = []
+            deals = get_sheet_records(GoogleSheetsConfig.DEALS_SHEET) or []
         else:
             deals = get_demo_data()["deals"]
 
@@ -263,35 +389,20 @@ def get_deal_stats():
     """Get deal statistics."""
     try:
         if sheets_manager:
-            deals_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.DEALS_SHEET, create_if_missing=False)
-            if deals_worksheet:
-                deals = deals_worksheet.get_all_records()
-            else:
-                deals = []
+            deals = get_sheet_records(GoogleSheetsConfig.DEALS_SHEET) or []
         else:
             deals = get_demo_data()["deals"]
 
+        df = pd.DataFrame(deals)
+
         # Calculate total revenue
-        usd_revenue = sum(deal.get("price", 0) for deal in deals if deal.get("currency") == "USD" and deal.get("status") == "Completed")
-        inr_revenue = sum(deal.get("price", 0) for deal in deals if deal.get("currency") == "INR" and deal.get("status") == "Completed")
+        usd_revenue, inr_revenue = completed_revenue(df)
 
         # Count by status
-        status_counts = {}
-        for deal in deals:
-            status = deal.get("status", "")
-            if status in status_counts:
-                status_counts[status] += 1
-            else:
-                status_counts[status] = 1
+        status_counts = count_values(df, "status")
 
         # Count by package
-        package_counts = {}
-        for deal in deals:
-            package = deal.get("package", "")
-            if package in package_counts:
-                package_counts[package] += 1
-            else:
-                package_counts[package] = 1
+        package_counts = count_values(df, "package")
 
         return jsonify({
             "success": True,
@@ -316,16 +427,10 @@ def get_content():
     """Get content schedule."""
     try:
         # Read content schedule from the most recent file
-        schedule_dir = "../data/schedules"
-        if os.path.exists(schedule_dir):
-            schedule_files = [f for f in os.listdir(schedule_dir) if f.startswith("content_schedule_") and f.endswith(".json")]
-            schedule_files.sort(reverse=True)  # Sort by filename (which includes date)
-
-            if schedule_files:
-                schedule_file = os.path.join(schedule_dir, schedule_files[0])
-                with open(schedule_file, "r") as f:
-                    schedule = json.load(f)
+        if os.path.exists(SCHEDULE_DIR):
+            schedule = get_latest_schedule()
 
+            if schedule is not None:
                 # Convert to list of content items
                 content = []
                 for date, item in schedule.items():
@@ -363,16 +468,10 @@ def get_content_stats():
         content = None
 
         # Read content schedule from the most recent file
-        schedule_dir = "../data/schedules"
-        if os.path.exists(schedule_dir):
-            schedule_files = [f for f in os.listdir(schedule_dir) if f.startswith("content_schedule_") and f.endswith(".json")]
-            schedule_files.sort(reverse=True)  # Sort by filename (which includes date)
-
-            if schedule_files:
-                schedule_file = os.path.join(schedule_dir, schedule_files[0])
-                with open(schedule_file, "r") as f:
-                    schedule = json.load(f)
+        if os.path.exists(SCHEDULE_DIR):
+            schedule = get_latest_schedule()
 
+            if schedule is not None:
                 # Convert to list of content items
                 content = []
                 for date, item in schedule.items():
@@ -388,20 +487,11 @@ def get_content_stats():
             content = get_demo_data()["content"]
 
         # Count by platform
-        platform_counts = {"x": 0, "instagram": 0}
-        for item in content:
-            for platform in item.get("platforms", []):
-                if platform in platform_counts:
-                    platform_counts[platform] += 1
+        platforms = Counter(platform for item in content for platform in item.get("platforms", []))
+        platform_counts = {platform: platforms[platform] for platform in ("x", "instagram")}
 
         # Count by category if available
-        category_counts = {}
-        for item in content:
-            category = item.get("category", "unknown")
-            if category in category_counts:
-                category_counts[category] += 1
-            else:
-                category_counts[category] = 1
+        category_counts = count_values(pd.DataFrame(content), "category", "unknown")
 
         return jsonify({
             "success": True,
@@ -423,27 +513,15 @@ def get_funnel():
     """Get sales funnel data."""
     try:
         if sheets_manager:
-            leads = sheets_manager.get_leads()
+            leads = get_sheet_records(GoogleSheetsConfig.LEADS_SHEET) or []
         else:
             leads = get_demo_data()["leads"]
 
         # Count leads by status for funnel
         status_order = ["New", "Contacted", "Engaged", "Opportunity", "Deal Sent", "Customer"]
-        funnel_data = []
-
-        status_counts = {}
-        for lead in leads:
-            status = lead.get("status", "New")
-            if status in status_counts:
-                status_counts[status] += 1
-            else:
-                status_counts[status] = 1
+        status_counts = Counter(lead.get("status", "New") for lead in leads)
 
-        for status in status_order:
-            funnel_data.append({
-                "status": status,
-                "count": status_counts.get(status, 0)
-            })
+        funnel_data = [{"status": status, "count": status_counts[status]} for status in status_order]
 
         return jsonify({
             "success": True,
@@ -465,18 +543,19 @@ def get_overview():
 
         # Use real data if available
         if sheets_manager:
-            leads = sheets_manager.get_leads()
-            outreach_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.OUTREACH_SHEET, create_if_missing=False)
-            deals_worksheet = sheets_manager._get_worksheet(GoogleSheetsConfig.DEALS_SHEET, create_if_missing=False)
-
-            if outreach_worksheet:
-                outreach = outreach_worksheet.get_all_records()
-            else:
+            records = get_sheets_records([
+                GoogleSheetsConfig.LEADS_SHEET,
+                GoogleSheetsConfig.OUTREACH_SHEET,
+                GoogleSheetsConfig.DEALS_SHEET
+            ])
+            leads = records[GoogleSheetsConfig.LEADS_SHEET] or []
+            outreach = records[GoogleSheetsConfig.OUTREACH_SHEET]
+            deals = records[GoogleSheetsConfig.DEALS_SHEET]
+
+            if outreach is None:
                 outreach = demo_data["outreach"]
 
-            if deals_worksheet:
-                deals = deals_worksheet.get_all_records()
-            else:
+            if deals is None:
                 deals = demo_data["deals"]
         else:
             leads = demo_data["leads"]
@@ -485,18 +564,18 @@ def get_overview():
 
         # Calculate conversion rates
         total_leads = len(leads)
-        engaged_leads = sum(1 for lead in leads if lead.get("status") in ["Engaged", "Opportunity", "Deal Sent", "Customer"])
-        customers = sum(1 for lead in leads if lead.get("status") == "Customer")
+        status_counts = Counter(lead.get("status") for lead in leads)
+        engaged_leads = sum(status_counts[status] for status in ("Engaged", "Opportunity", "Deal Sent", "Customer"))
+        customers = status_counts["Customer"]
 
         engagement_rate = (engaged_leads / total_leads * 100) if total_leads > 0 else 0
         conversion_rate = (customers / total_leads * 100) if total_leads > 0 else 0
 
         # Calculate total revenue
-        usd_revenue = sum(deal.get("price", 0) for deal in deals if deal.get("currency") == "USD" and deal.get("status") == "Completed")
-        inr_revenue = sum(deal.get("price", 0) for deal in deals if deal.get("currency") == "INR" and deal.get("status") == "Completed")
+        usd_revenue, inr_revenue = completed_revenue(pd.DataFrame(deals))
 
         # Get recent activities
-        recent_outreach = sorted(outreach, key=lambda x: x.get("date_sent", ""), reverse=True)[:5]
+        recent_outreach = heapq.nlargest(5, outreach, key=lambda x: x.get("date_sent", ""))
 
         return jsonify({
             "success": True,
@@ -9,13 +9,20 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 import gspread
+from gspread.utils import absolute_range_name, numericise_all
 from oauth2client.service_account import ServiceAccountCredentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 
 from config import GoogleSheetsConfig
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connection pool for the gspread session
+SHEETS_POOL_CONNECTIONS = 16
+SHEETS_POOL_MAXSIZE = 32
+
 class GoogleSheetsManager:
     """
     Manages interactions with Google Sheets for lead storage and tracking.
@@ -51,6 +58,21 @@ class GoogleSheetsManager:
         try:
             credentials = ServiceAccountCredentials.from_json_keyfile_name(self.credentials_file, self.scope)
             self.client = gspread.authorize(credentials)
+
+            # Reuse pooled keep-alive connections across calls. Only idempotent
+            # methods are retried; POSTs may append rows.
+            self.client.session.mount("https://", HTTPAdapter(
+                pool_connections=SHEETS_POOL_CONNECTIONS,
+                pool_maxsize=SHEETS_POOL_MAXSIZE,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=frozenset(["GET", "PUT"]),
+                    raise_on_status=False
+                )
+            ))
+
             self.sheet = self.client.open_by_key(self.sheet_id)
             logger.info("Successfully authenticated with Google Sheets")
         except Exception as e:
@@ -195,6 +217,40 @@ class GoogleSheetsManager:
             logger.error(f"Error getting leads from Google Sheets: {str(e)}")
             return []
 
+    def batch_get_records(self, sheet_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get all records of several worksheets with a single API call.
+
+        Records are built the same way as get_all_records: keyed by the header
+        row, with numeric strings converted and short rows padded.
+
+        Args:
+            sheet_names: Names of the worksheets
+
+        Returns:
+            Dictionary of worksheet name to records, empty if the call failed
+        """
+        try:
+            response = self.sheet.values_batch_get([absolute_range_name(name) for name in sheet_names])
+
+            records = {}
+            for name, value_range in zip(sheet_names, response.get("valueRanges", [])):
+                values = value_range.get("values", [])
+                if not values:
+                    records[name] = []
+                    continue
+
+                headers = values[0]
+                records[name] = [
+                    dict(zip(headers, numericise_all(row + [""] * (len(headers) - len(row)))))
+                    for row in values[1:]
+                ]
+
+            return records
+        except Exception as e:
+            logger.error(f"Error batch getting records from Google Sheets: {str(e)}")
+            return {}
+
     def update_lead_status(self, lead_id: str, status: str) -> bool:
         """
         Update the status of a lead.